@@ -16,6 +16,8 @@ def from_env() -> OMConfig:
         config_kwargs["observer_token_threshold"] = int(os.environ["OM_OBSERVER_THRESHOLD"])
     if "OM_REFLECTOR_THRESHOLD" in os.environ:
         config_kwargs["reflector_token_threshold"] = int(os.environ["OM_REFLECTOR_THRESHOLD"])
+    if "OM_REFLECT_MIN_TOKENS" in os.environ:
+        config_kwargs["reflect_min_tokens"] = int(os.environ["OM_REFLECT_MIN_TOKENS"])
     if "OM_MAX_MESSAGE_HISTORY" in os.environ:
         config_kwargs["max_message_history_tokens"] = int(os.environ["OM_MAX_MESSAGE_HISTORY"])
         
@@ -30,8 +32,14 @@ def from_env() -> OMConfig:
         config_kwargs["auto_observe"] = os.environ["OM_AUTO_OBSERVE"].lower() in ("true", "1", "yes")
     if "OM_AUTO_REFLECT" in os.environ:
         config_kwargs["auto_reflect"] = os.environ["OM_AUTO_REFLECT"].lower() in ("true", "1", "yes")
+    if "OM_INCREMENTAL_REFLECTION" in os.environ:
+        config_kwargs["incremental_reflection"] = os.environ["OM_INCREMENTAL_REFLECTION"].lower() in ("true", "1", "yes")
     if "OM_BLOCKING_MODE" in os.environ:
         config_kwargs["blocking_mode"] = os.environ["OM_BLOCKING_MODE"].lower() in ("true", "1", "yes")
+    if "OM_MAX_INFLIGHT_LLM" in os.environ:
+        config_kwargs["max_inflight_llm"] = int(os.environ["OM_MAX_INFLIGHT_LLM"])
+    if "OM_ENABLE_CACHE" in os.environ:
+        config_kwargs["enable_cache"] = os.environ["OM_ENABLE_CACHE"].lower() in ("true", "1", "yes")
 
     # Tracking
     if "OM_TRACK_COSTS" in os.environ:
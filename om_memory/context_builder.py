@@ -40,18 +40,20 @@ class ContextBuilder:
         
         # Apply message_token_budget: trim oldest messages to fit budget
         if message_token_budget and msg_total_tokens > message_token_budget:
-            trimmed_messages = []
+            kept = 0
             budget_remaining = message_token_budget
-            # Keep newest messages first
+            # Keep newest messages first; counts were filled in by count_messages.
+            # Stops at the first message that doesn't fit, so only the kept
+            # tail is walked.
             for m in reversed(messages):
-                t = m.token_count or self.token_counter.count(f"{m.role}: {m.content}")
+                t = m.token_count
                 if budget_remaining >= t:
-                    trimmed_messages.insert(0, m)
+                    kept += 1
                     budget_remaining -= t
                 else:
                     break
-            messages = trimmed_messages
-            msg_total_tokens = self.token_counter.count_messages(messages)
+            messages = messages[len(messages) - kept:]
+            msg_total_tokens = message_token_budget - budget_remaining
         
         # Truncate observations if combined budget exceeded
         if max_tokens and (obs_total_tokens + msg_total_tokens > max_tokens):
@@ -63,14 +65,14 @@ class ContextBuilder:
             kept_obs = []
             current_tokens = msg_total_tokens
             for o in sorted_obs:
-                t = o.token_count or self.token_counter.count(o.content)
+                t = o.token_count
                 if current_tokens + t <= max_tokens:
                     kept_obs.append(o)
                     current_tokens += t
             
             observations = sorted(kept_obs, key=lambda x: x.observation_date)
             obs_log.observations = observations
-            obs_log.total_tokens = self.token_counter.count_observations(observations)
+            obs_log.total_tokens = current_tokens - msg_total_tokens
             obs_total_tokens = obs_log.total_tokens
 
         if format == "dict":
@@ -137,6 +139,7 @@ class ContextBuilder:
                 suggested_next = o.content.replace("SUGGESTED NEXT:", "").strip()
                 
         msg_dicts = [{"role": m.role, "content": m.content, "timestamp": m.timestamp.isoformat()} for m in messages]
+        msg_tokens = self.token_counter.count_messages(messages)
         
         return {
             "observations_text": obs_log.to_context_string(),
@@ -145,8 +148,8 @@ class ContextBuilder:
             "suggested_next": suggested_next,
             "stats": {
                 "observation_tokens": obs_log.total_tokens,
-                "message_tokens": self.token_counter.count_messages(messages),
-                "total_tokens": obs_log.total_tokens + self.token_counter.count_messages(messages),
+                "message_tokens": msg_tokens,
+                "total_tokens": obs_log.total_tokens + msg_tokens,
                 "cache_eligible_tokens": obs_log.total_tokens
             }
         }
@@ -5,7 +5,7 @@ from typing import Callable, Union
 
 from om_memory.models import OMConfig, OMStats, Message, Observation
 from om_memory.providers.base import LLMProvider
-from om_memory.providers.openai_provider import OpenAIProvider
+from om_memory.providers.caching import CachingLLMProvider
 from om_memory.storage.base import StorageBackend
 from om_memory.storage.sqlite import SQLiteStorage
 from om_memory.observability.callbacks import CallbackManager, EventType, OMEvent
@@ -49,10 +49,18 @@ class ObservationalMemory:
             
         self.provider = provider
         if not self.provider:
+            # Imported here so the openai SDK only loads when it is the default
+            from om_memory.providers.openai_provider import OpenAIProvider
             self.provider = OpenAIProvider(
                 model=self.config.observer_model or "gpt-4o-mini",
                 api_key=api_key
             )
+        if self.config.enable_cache and not isinstance(self.provider, CachingLLMProvider):
+            self.provider = CachingLLMProvider(
+                self.provider,
+                maxsize=self.config.cache_maxsize,
+                ttl=self.config.cache_ttl_seconds
+            )
             
         self.storage = storage
         if not self.storage:
@@ -104,9 +112,11 @@ class ObservationalMemory:
             if not task.done():
                 task.cancel()
         await self.storage.aclose()
+        await self.provider.aclose()
         
     def close(self) -> None:
         self.storage.close()
+        self.provider.close()
 
     async def __aenter__(self):
         await self.ainitialize()
@@ -216,7 +226,14 @@ class ObservationalMemory:
         """
         Queue an observation task with proper error handling.
         Unlike bare create_task, this catches and logs failures.
+
+        At most one observation runs per thread. While it is in flight,
+        later threshold crossings are skipped; the messages they would have
+        covered stay stored and are picked up by the next run.
         """
+        pending = self._buffer_tasks.get(thread_id)
+        if pending is not None and not pending.done():
+            return
         task = asyncio.create_task(
             self._safe_observe(thread_id, messages, resource_id=resource_id)
         )
@@ -235,6 +252,12 @@ class ObservationalMemory:
                 data={"error": str(e), "source": "async_buffer"}
             ))
 
+    async def aflush(self) -> None:
+        """Wait for observations queued in non-blocking mode to finish."""
+        pending = [t for t in self._buffer_tasks.values() if not t.done()]
+        if pending:
+            await asyncio.gather(*pending)
+
     # --- INTERNAL OBSERVATION/REFLECTION ---
 
     async def _run_observe(self, thread_id: str, messages: list[Message], resource_id: str = None) -> list[Observation]:
@@ -259,6 +282,9 @@ class ObservationalMemory:
                 for obs in new_obs:
                     obs.resource_id = resource_id
             
+            # Count once here so the stored row carries token_count and later
+            # reads never re-encode it.
+            new_tokens = self.token_counter.count_observations(new_obs)
             await self.storage.asave_observations(new_obs)
             
             # ROLLING WINDOW: Delete compressed messages, keep last N
@@ -273,7 +299,7 @@ class ObservationalMemory:
             
             # Check if reflection is needed (Block 1 too large)
             all_obs = observations + new_obs
-            obs_tokens = self.token_counter.count_observations(all_obs)
+            obs_tokens = self.token_counter.count_observations(observations) + new_tokens
             
             if self.config.auto_reflect and obs_tokens >= self.config.reflector_token_threshold:
                 await self._run_reflect(thread_id, all_obs, resource_id=resource_id)
@@ -293,7 +319,9 @@ class ObservationalMemory:
         new_obs = await self.reflector.areflect(
             thread_id, observations, self.callbacks, resource_id=resource_id
         )
-        if new_obs:
+        # The reflector hands back the same list when it skipped or failed
+        if new_obs and new_obs is not observations:
+            self.token_counter.count_observations(new_obs)
             await self.storage.areplace_observations(thread_id, new_obs)
         return new_obs
 
@@ -323,8 +351,8 @@ class ObservationalMemory:
 
     # --- EVENT SYSTEM ---
     
-    def on(self, event_type: EventType, callback: Callable) -> None:
-        self.callbacks.on(event_type, callback)
+    def on(self, event_type: EventType, callback: Callable, safe: bool = False) -> None:
+        self.callbacks.on(event_type, callback, safe=safe)
 
     # --- THREAD MANAGEMENT ---
 
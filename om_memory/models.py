@@ -84,6 +84,8 @@ class OMConfig(BaseModel):
     # Thresholds
     observer_token_threshold: int = 30000
     reflector_token_threshold: int = 5000
+    reflect_min_tokens: int = 500           # Skip reflection passes smaller than this
+    incremental_reflection: bool = True     # Frame the prior reflection as a summary to merge new observations into
     max_message_history_tokens: int = 50000
     
     # Rolling window — messages to retain after observation
@@ -104,6 +106,12 @@ class OMConfig(BaseModel):
     auto_observe: bool = True
     auto_reflect: bool = True
     blocking_mode: bool = True
+    max_inflight_llm: int = 32              # Cap on concurrent Observer/Reflector LLM calls
+    
+    # Response cache for identical Observer/Reflector prompts
+    enable_cache: bool = False
+    cache_maxsize: int = 1024
+    cache_ttl_seconds: float = 3600.0
     
     # Observation format
     use_emoji_priority: bool = True
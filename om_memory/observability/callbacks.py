@@ -1,5 +1,6 @@
+import logging
 from enum import Enum
-from typing import Callable, Any, Dict, List
+from typing import Callable, Any, Dict, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -19,6 +20,7 @@ class EventType(Enum):
     REFLECTOR_STARTED = "reflector_started"
     REFLECTOR_COMPLETED = "reflector_completed"
     REFLECTOR_ERROR = "reflector_error"
+    REFLECTOR_SKIPPED = "reflector_skipped"         # Nothing worth consolidating
     
     # Cost events
     TOKENS_USED = "tokens_used"
@@ -30,6 +32,9 @@ class EventType(Enum):
     OBSERVATIONS_CONSOLIDATED = "observations_consolidated"  # After reflection
 
 
+logger = logging.getLogger("om_memory")
+
+
 @dataclass
 class OMEvent:
     type: EventType
@@ -41,26 +46,33 @@ class OMEvent:
 class CallbackManager:
     """
     Manages event callbacks. Users register handlers for specific events.
+    
+    Handlers registered with ``safe=True`` are trusted not to raise and are
+    called without an exception guard.
     """
     
     def __init__(self):
-        self._handlers: Dict[EventType, List[Callable[[OMEvent], None]]] = {
+        self._handlers: Dict[EventType, List[Tuple[Callable[[OMEvent], None], bool]]] = {
             event_type: [] for event_type in EventType
         }
         
-    def on(self, event_type: EventType, callback: Callable[[OMEvent], None]) -> None:
-        if callback not in self._handlers[event_type]:
-            self._handlers[event_type].append(callback)
+    def on(self, event_type: EventType, callback: Callable[[OMEvent], None], safe: bool = False) -> None:
+        handlers = self._handlers[event_type]
+        if all(cb != callback for cb, _ in handlers):
+            handlers.append((callback, safe))
             
     def remove(self, event_type: EventType, callback: Callable[[OMEvent], None]) -> None:
-        if callback in self._handlers[event_type]:
-            self._handlers[event_type].remove(callback)
+        self._handlers[event_type] = [
+            (cb, safe) for cb, safe in self._handlers[event_type] if cb != callback
+        ]
             
     def emit(self, event: OMEvent) -> None:
-        for handler in self._handlers[event.type]:
+        for handler, safe in self._handlers[event.type]:
+            if safe:
+                handler(event)
+                continue
             try:
                 handler(event)
-            except Exception as e:
+            except Exception:
                 # Log but don't crash the main flow due to callback error
-                # In a real system, use standard logging
-                print(f"Callback error in {event.type.value}: {str(e)}")
+                logger.exception("Callback error in %s", event.type.value)
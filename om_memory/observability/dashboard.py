@@ -1,3 +1,13 @@
+from om_memory.models import Priority
+
+# Streamlit markdown colors per priority (Streamlit has no "yellow", orange is closest)
+_PRIO_COLOR = {
+    Priority.CRITICAL: "red",
+    Priority.IMPORTANT: "orange",
+    Priority.INFO: "green",
+}
+
+
 def render_om_dashboard(om, thread_id: str = None):
     """
     Renders a Streamlit dashboard showing OM's internal state.
@@ -49,8 +59,8 @@ def render_om_dashboard(om, thread_id: str = None):
         st.write("No observations recorded yet.")
     else:
         for obs in observations:
-            color = "red" if obs.priority == getattr(obs.priority, "CRITICAL", "🔴") else "yellow" if obs.priority == getattr(obs.priority, "IMPORTANT", "🟡") else "green"
-            st.markdown(f"**{obs.priority.value} {obs.observation_date.strftime('%Y-%m-%d %H:%M')}** - {obs.content}")
+            color = _PRIO_COLOR.get(obs.priority, "green")
+            st.markdown(f":{color}[**{obs.priority.value} {obs.observation_date.strftime('%Y-%m-%d %H:%M')}**] - {obs.content}")
             if obs.referenced_date or obs.relative_date:
                 st.caption(f"*Context: {obs.relative_date or obs.referenced_date}*")
                 
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Tuple
 from om_memory.models import OMStats, OMConfig
 
 class MetricsTracker:
@@ -9,6 +9,8 @@ class MetricsTracker:
     def __init__(self, config: OMConfig):
         self.config = config
         self._threads: Dict[str, OMStats] = {}
+        # thread_id -> (total_input_tokens, rag_cost) the estimate was computed for
+        self._rag_cost_cache: Dict[str, Tuple[int, float]] = {}
         
     def _get_or_create_stats(self, thread_id: str) -> OMStats:
         if thread_id not in self._threads:
@@ -70,12 +72,16 @@ class MetricsTracker:
         return self._get_or_create_stats(thread_id)
         
     def get_global_stats(self) -> dict:
-        totals = {
+        total_savings = 0.0
+        total_tokens_saved = 0
+        for s in self._threads.values():
+            total_savings += s.cost_savings
+            total_tokens_saved += s.total_cached_tokens
+        return {
             "total_threads": len(self._threads),
-            "total_savings": sum(s.cost_savings for s in self._threads.values()),
-            "total_tokens_saved": sum(s.total_cached_tokens for s in self._threads.values())
+            "total_savings": total_savings,
+            "total_tokens_saved": total_tokens_saved
         }
-        return totals
         
     def estimate_rag_cost(self, thread_id: str) -> float:
         """
@@ -84,6 +90,10 @@ class MetricsTracker:
         """
         stats = self._get_or_create_stats(thread_id)
         
+        cached = self._rag_cost_cache.get(thread_id)
+        if cached is not None and cached[0] == stats.total_input_tokens:
+            return cached[1]
+        
         # Rough estimation
         # Baseline context injected every turn continuously
         estimated_total_raw_tokens = stats.total_input_tokens * 2 # Simulated repeated injection
@@ -92,6 +102,7 @@ class MetricsTracker:
         cost = (estimated_total_raw_tokens / 1000) * self.config.cost_per_1k_input_tokens
         # Vector search overhead + embedding (~10-20% extra)
         cost *= 1.15
+        self._rag_cost_cache[thread_id] = (stats.total_input_tokens, cost)
         return cost
         
     def get_savings_report(self, thread_id: str) -> dict:
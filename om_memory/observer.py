@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 
 from om_memory.models import Message, Observation, OMConfig
 from om_memory.providers.base import LLMProvider
+from om_memory.providers.concurrency import get_semaphore
 from om_memory.observability.callbacks import CallbackManager, OMEvent, EventType
 from om_memory.token_counter import TokenCounter
 from om_memory.prompts.observer_prompt import OBSERVER_SYSTEM_PROMPT
@@ -21,6 +22,8 @@ class Observer:
         self.provider = provider
         self.config = config
         self.token_counter = token_counter
+        # The system prompt is constant, so tokenize it once
+        self._sys_tokens = token_counter.count(OBSERVER_SYSTEM_PROMPT)
         
     async def aobserve(
         self, 
@@ -40,21 +43,22 @@ class Observer:
         if existing_observations:
             # Only last 5 observations, content only — minimal tokens for dedup
             recent = existing_observations[-5:]
-            context_str = "; ".join([o.content for o in recent])
+            context_str = "; ".join(o.content for o in recent)
         else:
             context_str = "None"
             
         # Build the user prompt with only the messages to compress
-        user_prompt = f"Existing context: {context_str}\n\nMessages:\n"
-        for msg in messages:
-            user_prompt += f"{msg.role}: {msg.content}\n"
+        parts = [f"Existing context: {context_str}\n\nMessages:\n"]
+        parts.extend(f"{msg.role}: {msg.content}\n" for msg in messages)
+        user_prompt = "".join(parts)
             
         system_prompt = OBSERVER_SYSTEM_PROMPT
         
-        input_tokens = self.token_counter.count(system_prompt + "\n" + user_prompt)
+        input_tokens = self._sys_tokens + self.token_counter.count(user_prompt) + 1
 
         try:
-            llm_response = await self.provider.acomplete(system_prompt, user_prompt)
+            async with get_semaphore(self.config):
+                llm_response = await self.provider.acomplete(system_prompt, user_prompt)
         except Exception as e:
             if callbacks:
                 callbacks.emit(OMEvent(type=EventType.OBSERVER_ERROR, thread_id=thread_id, timestamp=datetime.now(timezone.utc), data={"error": str(e)}))
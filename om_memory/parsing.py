@@ -7,10 +7,35 @@ Used by both Observer and Reflector to avoid code duplication.
 
 import re
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timezone
 
 from om_memory.models import Observation, Priority
 
+# Priority marker -> Priority; the leftmost marker on a line wins.
+_PRIORITY_BY_VALUE = {p.value: p for p in Priority}
+_PRIO_RE = re.compile("|".join(re.escape(v) for v in _PRIORITY_BY_VALUE))
+
+_TASK_RE = re.compile(r"CURRENT_TASK:\s*(.*)")
+_NEXT_RE = re.compile(r"SUGGESTED_NEXT:\s*(.*)")
+_TIME_RE = re.compile(r"(\d{2}:\d{2})")
+_REF_RE = re.compile(r"\(([^)]*referenced[^)]*)\)")
+_DATE_RE = re.compile(r"referenced:\s*(\d{4}-\d{1,2}-\d{1,2})")
+_MEANING_RE = re.compile(r'meaning\s*"([^"]+)"')
+# LLMs sometimes drop the zero padding (2026-3-1), which fromisoformat rejects
+_LOOSE_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+
+def _parse_date(text: str) -> date:
+    """YYYY-MM-DD, with or without zero padding. Raises ValueError otherwise."""
+    try:
+        # fromisoformat is a C parser; strptime is ~30x slower
+        return date.fromisoformat(text)
+    except ValueError:
+        match = _LOOSE_DATE_RE.fullmatch(text)
+        if match is None:
+            raise
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+
 
 def parse_observations(
     llm_response: str,
@@ -40,8 +65,8 @@ def parse_observations(
     current_date = datetime.now(timezone.utc)
 
     # Extract CURRENT_TASK and SUGGESTED_NEXT
-    task_match = re.search(r"CURRENT_TASK:\s*(.*)", llm_response)
-    next_match = re.search(r"SUGGESTED_NEXT:\s*(.*)", llm_response)
+    task_match = _TASK_RE.search(llm_response)
+    next_match = _NEXT_RE.search(llm_response)
 
     if task_match:
         observations.append(Observation(
@@ -63,14 +88,15 @@ def parse_observations(
             source_message_ids=source_message_ids,
         ))
 
-    lines = llm_response.split("\n")
-
-    for line in lines:
+    for line in llm_response.split("\n"):
         line = line.strip()
-        if line.startswith("Date:"):
+        if not line:
+            continue
+
+        head = line[0]
+        if head == "D" and line.startswith("Date:"):
             try:
-                date_str = line.split(":", 1)[1].strip()
-                parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+                parsed_date = _parse_date(line[5:].strip())
                 current_date = datetime.combine(
                     parsed_date, current_date.time(), tzinfo=timezone.utc
                 )
@@ -78,78 +104,67 @@ def parse_observations(
                 pass  # Ignore parse errors, keep current utc
             continue
 
-        if line.startswith("-") and any(
-            emoji in line for emoji in ["🔴", "🟡", "🟢"]
-        ):
-            try:
-                # Determine priority
-                priority_val = Priority.INFO
-                for p in Priority:
-                    if p.value in line:
-                        priority_val = p
-                        break
-
-                # Extract time and content
-                time_match = re.search(r"(\d{2}:\d{2})", line)
-                obs_time = current_date.time()
-                if time_match:
-                    obs_time = datetime.strptime(
-                        time_match.group(1), "%H:%M"
-                    ).time()
-
-                content_start = line.find(priority_val.value) + len(
-                    priority_val.value
-                )
-                if time_match:
-                    content_start = line.find(time_match.group(1)) + len(
-                        time_match.group(1)
-                    )
-
-                raw_content = line[content_start:].strip()
-
-                # Extract references
-                ref_date = None
-                rel_date = None
-                ref_match = re.search(r"\(([^)]*referenced[^)]*)\)", raw_content)
-                if ref_match:
-                    ref_str = ref_match.group(1)
-                    raw_content = raw_content.replace(f"({ref_str})", "").strip()
-
-                    date_match = re.search(
-                        r"referenced:\s*(\d{4}-\d{2}-\d{2})", ref_str
-                    )
-                    if date_match:
-                        try:
-                            ref_date = datetime.strptime(
-                                date_match.group(1), "%Y-%m-%d"
-                            ).replace(tzinfo=timezone.utc)
-                        except Exception:
-                            pass
-
-                    meaning_match = re.search(
-                        r'meaning\s*"([^"]+)"', ref_str
-                    )
-                    if meaning_match:
-                        rel_date = meaning_match.group(1)
-
-                obs_date = datetime.combine(
-                    current_date.date(), obs_time, tzinfo=timezone.utc
-                )
+        if head != "-":
+            continue
 
-                obs = Observation(
-                    id=str(uuid.uuid4()),
-                    thread_id=thread_id,
-                    resource_id=resource_id,
-                    observation_date=obs_date,
-                    referenced_date=ref_date,
-                    relative_date=rel_date,
-                    priority=priority_val,
-                    content=raw_content,
-                    source_message_ids=source_message_ids,
-                )
-                observations.append(obs)
-            except Exception:
-                # Ignore malformed lines gracefully
-                pass
+        # Detect the observation line and its priority in a single scan
+        prio_match = _PRIO_RE.search(line)
+        if prio_match is None:
+            continue
+        priority_val = _PRIORITY_BY_VALUE[prio_match.group()]
+
+        try:
+            # Extract time and content
+            time_match = _TIME_RE.search(line)
+            obs_time = current_date.time()
+            if time_match:
+                hh_mm = time_match.group(1)
+                obs_time = time(int(hh_mm[:2]), int(hh_mm[3:]))
+                content_start = time_match.end(1)
+            else:
+                content_start = prio_match.end()
+
+            raw_content = line[content_start:].strip()
+
+            # Extract references
+            ref_date = None
+            rel_date = None
+            ref_match = _REF_RE.search(raw_content)
+            if ref_match:
+                ref_str = ref_match.group(1)
+                raw_content = raw_content.replace(f"({ref_str})", "").strip()
+
+                date_match = _DATE_RE.search(ref_str)
+                if date_match:
+                    try:
+                        ref_date = datetime.combine(
+                            _parse_date(date_match.group(1)), time(), tzinfo=timezone.utc
+                        )
+                    except Exception:
+                        pass
+
+                meaning_match = _MEANING_RE.search(ref_str)
+                if meaning_match:
+                    rel_date = meaning_match.group(1)
+
+            obs_date = datetime.combine(
+                current_date.date(), obs_time, tzinfo=timezone.utc
+            )
+
+            obs = Observation(
+                id=str(uuid.uuid4()),
+                thread_id=thread_id,
+                resource_id=resource_id,
+                observation_date=obs_date,
+                referenced_date=ref_date,
+                relative_date=rel_date,
+                priority=priority_val,
+                content=raw_content,
+                source_message_ids=source_message_ids,
+            )
+            observations.append(obs)
+        except Exception:
+            # Ignore malformed lines gracefully
+            pass
 
     return observations
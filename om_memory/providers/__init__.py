@@ -1,9 +1,20 @@
+import importlib
+
 from om_memory.providers.base import LLMProvider
-from om_memory.providers.openai_provider import OpenAIProvider
-from om_memory.providers.anthropic_provider import AnthropicProvider
-from om_memory.providers.ollama_provider import OllamaProvider
-from om_memory.providers.litellm_provider import LiteLLMProvider
-from om_memory.providers.gemini_provider import GeminiProvider
+
+# Provider modules import their SDKs at module level, so they are only loaded
+# on first attribute access (PEP 562) rather than on `import om_memory`.
+_LAZY = {
+    "OpenAIProvider": "om_memory.providers.openai_provider",
+    "AnthropicProvider": "om_memory.providers.anthropic_provider",
+    "OllamaProvider": "om_memory.providers.ollama_provider",
+    "LiteLLMProvider": "om_memory.providers.litellm_provider",
+    "GeminiProvider": "om_memory.providers.gemini_provider",
+    "CachingLLMProvider": "om_memory.providers.caching",
+    "FallbackLLMProvider": "om_memory.providers.fallback",
+    "AllProvidersFailedError": "om_memory.providers.fallback",
+    "RouterProvider": "om_memory.providers.router",
+}
 
 __all__ = [
     "LLMProvider",
@@ -12,4 +23,20 @@ __all__ = [
     "OllamaProvider",
     "LiteLLMProvider",
     "GeminiProvider",
+    "CachingLLMProvider",
+    "FallbackLLMProvider",
+    "AllProvidersFailedError",
+    "RouterProvider",
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,83 @@
+"""
+Shared httpx clients for HTTP-backed providers.
+
+All providers share one connection pool (and DNS cache) instead of each
+allocating its own. The async client is kept per event loop because an
+httpx pool cannot outlive the loop it was first used on, and the sync
+wrappers in core run each call on a fresh loop.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=128, max_keepalive_connections=64)
+DEFAULT_TIMEOUT = 60.0
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_client: Optional[httpx.Client] = None
+# Async clients that aclose_all() couldn't reach, to be closed on their own loop
+_retired: "weakref.WeakSet[httpx.AsyncClient]" = weakref.WeakSet()
+_closing: set = set()
+_client_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Shared AsyncClient for the running loop, recreated if it was closed."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is not None and client in _retired:
+        # aclose_all() ran while this loop was idle; close it now that it can
+        _retired.discard(client)
+        task = loop.create_task(client.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+        client = None
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=DEFAULT_LIMITS, timeout=DEFAULT_TIMEOUT)
+        _async_clients[loop] = client
+    return client
+
+
+def get_client() -> httpx.Client:
+    """Shared sync Client, recreated if it was closed."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(limits=DEFAULT_LIMITS, timeout=DEFAULT_TIMEOUT)
+        return _client
+
+
+def close_all() -> None:
+    """Close the shared sync client."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def aclose_all() -> None:
+    """
+    Close the shared clients. This is process-wide teardown; providers don't
+    call it, since other instances may be mid-request on the same clients.
+
+    Clients on a loop running in another thread are closed on that loop.
+    Clients on an idle loop are retired and closed the next time that loop
+    asks for one. Clients on a closed loop can no longer do I/O; they stay in
+    the weak registry and are released with their loop.
+    """
+    loop = asyncio.get_running_loop()
+    for client_loop, client in list(_async_clients.items()):
+        if client.is_closed:
+            continue
+        if client_loop is loop:
+            await client.aclose()
+        elif client_loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), client_loop))
+        elif not client_loop.is_closed():
+            _retired.add(client)
+    close_all()
@@ -1,4 +1,7 @@
+import asyncio
 import os
+from typing import AsyncIterator, Optional, Union
+
 from om_memory.providers.base import LLMProvider
 
 try:
@@ -11,33 +14,116 @@ class AnthropicProvider(LLMProvider):
     Anthropic provider using the official `anthropic` package.
     """
     
-    def __init__(self, model: str = "claude-3-haiku-20240307", api_key: str = None):
+    def __init__(
+        self,
+        model: str = "claude-3-haiku-20240307",
+        api_key: str = None,
+        use_batch_api: bool = False,
+        batch_poll_interval: float = 30.0,
+        cache_system_prompt: bool = True
+    ):
         self._model = model
+        # Marks the system prompt as a prompt-cache breakpoint. Anthropic only
+        # caches prefixes of at least 1024 tokens (2048 on Haiku models);
+        # shorter prompts are sent normally and simply not cached.
+        self.cache_system_prompt = cache_system_prompt
+        # Message Batches are half price but may take up to 24h, so they are opt-in
+        self.use_batch_api = use_batch_api
+        self.batch_poll_interval = batch_poll_interval
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("Anthropic API key is required. Pass api_key or set ANTHROPIC_API_KEY.")
             
         self.async_client = AsyncAnthropic(api_key=self.api_key)
-        self.sync_client = Anthropic(api_key=self.api_key)
+        # Created on first sync call so async-only users hold a single pool
+        self._sync_client = None
         
     @property
     def model_name(self) -> str:
         return self._model
+        
+    @property
+    def sync_client(self):
+        if self._sync_client is None:
+            self._sync_client = Anthropic(api_key=self.api_key)
+        return self._sync_client
+        
+    def _build_system(self, system_prompt: str):
+        if self.cache_system_prompt and system_prompt:
+            return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        return system_prompt
 
     async def acomplete(self, system_prompt: str, user_prompt: str) -> str:
         response = await self.async_client.messages.create(
             model=self._model,
-            system=system_prompt,
+            system=self._build_system(system_prompt),
             messages=[{"role": "user", "content": user_prompt}],
             max_tokens=2000
         )
         return response.content[0].text
 
+    async def astream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        async with self.async_client.messages.stream(
+            model=self._model,
+            system=self._build_system(system_prompt),
+            messages=[{"role": "user", "content": user_prompt}],
+            max_tokens=2000
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
     def complete(self, system_prompt: str, user_prompt: str) -> str:
         response = self.sync_client.messages.create(
             model=self._model,
-            system=system_prompt,
+            system=self._build_system(system_prompt),
             messages=[{"role": "user", "content": user_prompt}],
             max_tokens=2000
         )
         return response.content[0].text
+
+    async def aclose(self) -> None:
+        await self.async_client.close()
+        self.close()
+
+    def close(self) -> None:
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    async def abatch_complete(
+        self,
+        pairs: list[tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> list[Union[str, Exception]]:
+        if not self.use_batch_api:
+            return await super().abatch_complete(pairs, max_concurrency=max_concurrency, semaphore=semaphore)
+            
+        batch = await self.async_client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": f"req-{i}",
+                    "params": {
+                        "model": self._model,
+                        "system": self._build_system(s),
+                        "messages": [{"role": "user", "content": u}],
+                        "max_tokens": 2000
+                    }
+                }
+                for i, (s, u) in enumerate(pairs)
+            ]
+        )
+        while batch.processing_status != "ended":
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await self.async_client.messages.batches.retrieve(batch.id)
+            
+        results: list[Union[str, Exception]] = [
+            RuntimeError(f"Anthropic batch {batch.id} returned no result")
+        ] * len(pairs)
+        async for entry in await self.async_client.messages.batches.results(batch.id):
+            idx = int(entry.custom_id.split("-", 1)[1])
+            if entry.result.type == "succeeded":
+                results[idx] = entry.result.message.content[0].text
+            else:
+                results[idx] = RuntimeError(f"Anthropic batch request {entry.custom_id} {entry.result.type}")
+        return results
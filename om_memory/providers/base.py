@@ -1,4 +1,7 @@
+import asyncio
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import AsyncIterator, Optional, Union
 
 class LLMProvider(ABC):
     """
@@ -23,3 +26,59 @@ class LLMProvider(ABC):
     def model_name(self) -> str:
         """Return the model identifier string."""
         pass
+    
+    @staticmethod
+    def build_messages(system_prompt: str, user_prompt: str) -> list[dict]:
+        """Chat-style message list: optional system message, then the user message."""
+        # The system prompt always goes first and unmodified so provider-side
+        # prefix caching (e.g. OpenAI's, for prompts of 1024+ tokens) can reuse it.
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": user_prompt})
+        return messages
+
+    async def astream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        """
+        Stream the completion as text chunks.
+        
+        The default yields the whole `acomplete` result as a single chunk;
+        providers with a streaming API override this.
+        """
+        yield await self.acomplete(system_prompt, user_prompt)
+    
+    async def abatch_complete(
+        self,
+        pairs: list[tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> list[Union[str, Exception]]:
+        """
+        Complete many (system_prompt, user_prompt) pairs.
+        
+        Results are returned in input order; a failed request yields its
+        exception in place of the response text. The default runs `acomplete`
+        concurrently, capped at `max_concurrency` in-flight calls when given;
+        each call also holds `semaphore`, if given, so the batch shares a cap
+        with other callers. Providers with a native batch API can override this.
+        """
+        local = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        if local is None and semaphore is None:
+            return await asyncio.gather(
+                *(self.acomplete(s, u) for s, u in pairs), return_exceptions=True
+            )
+        
+        async def _one(system_prompt: str, user_prompt: str) -> str:
+            async with local or nullcontext():
+                async with semaphore or nullcontext():
+                    return await self.acomplete(system_prompt, user_prompt)
+                
+        return await asyncio.gather(*(_one(s, u) for s, u in pairs), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Release any network resources held by the provider."""
+        pass
+
+    def close(self) -> None:
+        """Sync variant of aclose."""
+        pass
@@ -0,0 +1,122 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from om_memory.providers.base import LLMProvider
+
+
+class CachingLLMProvider(LLMProvider):
+    """
+    Wraps another provider and caches responses for byte-identical prompts.
+
+    Entries are kept in an LRU with a TTL. Concurrent async calls for the same
+    prompt share a single in-flight request instead of each hitting the LLM.
+    """
+
+    def __init__(self, delegate: LLMProvider, maxsize: int = 1024, ttl: float = 3600.0):
+        self.delegate = delegate
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, response)
+        self._cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model_name(self) -> str:
+        return self.delegate.model_name
+
+    def _make_key(self, system_prompt: str, user_prompt: str) -> str:
+        payload = json.dumps(
+            {"m": self.delegate.model_name, "s": system_prompt, "u": user_prompt},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, response = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def _set(self, key: str, response: str) -> None:
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttl, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    async def acomplete(self, system_prompt: str, user_prompt: str) -> str:
+        key = self._make_key(system_prompt, user_prompt)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        while pending is not None and pending.get_loop() is loop:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Only the leader's cancellation is absorbed; the follower
+                # retries, taking over the request if nobody else has.
+                if not pending.cancelled():
+                    raise
+            cached = self._get(key)
+            if cached is not None:
+                return cached
+            pending = self._inflight.get(key)
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            response = await self.delegate.acomplete(system_prompt, user_prompt)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures don't warn at GC time
+            future.exception()
+            raise
+        else:
+            self._set(key, response)
+            future.set_result(response)
+            return response
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def complete(self, system_prompt: str, user_prompt: str) -> str:
+        key = self._make_key(system_prompt, user_prompt)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+        response = self.delegate.complete(system_prompt, user_prompt)
+        self._set(key, response)
+        return response
+
+    async def aclose(self) -> None:
+        await self.delegate.aclose()
+
+    def close(self) -> None:
+        self.delegate.close()
@@ -0,0 +1,26 @@
+import asyncio
+import weakref
+
+from om_memory.models import OMConfig
+
+DEFAULT_MAX_INFLIGHT_LLM = 32
+
+# One semaphore per (event loop, limit): asyncio primitives cannot be shared
+# across loops, and the sync wrappers in core run each call on a fresh loop.
+# Keying by limit too keeps configs with different caps from replacing each
+# other's semaphore.
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[int, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def get_semaphore(cfg: OMConfig) -> asyncio.Semaphore:
+    """
+    Return the process-wide semaphore that caps in-flight LLM calls on the
+    running loop. Every Observer/Reflector call acquires it, so callers can
+    fan out with asyncio.gather without overrunning provider limits.
+    """
+    limit = cfg.max_inflight_llm or DEFAULT_MAX_INFLIGHT_LLM
+    by_limit = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = by_limit.get(limit)
+    if semaphore is None:
+        semaphore = by_limit[limit] = asyncio.Semaphore(limit)
+    return semaphore
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import httpx
+
+from om_memory.providers.base import LLMProvider
+
+logger = logging.getLogger("om_memory")
+
+# Exception class names used by the openai/anthropic SDKs for network-level
+# failures. Matched by name so neither SDK has to be importable here.
+_TRANSIENT_ERROR_NAMES = {"APITimeoutError", "APIConnectionError", "InternalServerError", "RateLimitError", "OverloadedError"}
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """True for rate limits, 5xx responses, timeouts and connection failures."""
+    status = _status_code(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    return type(exc).__name__ in _TRANSIENT_ERROR_NAMES
+
+
+class AllProvidersFailedError(Exception):
+    """Raised when every provider in a fallback chain failed or was skipped."""
+
+    def __init__(self, attempts: list[tuple[str, Optional[Exception]]]):
+        self.attempts = attempts
+        trace = "; ".join(
+            f"{name}: {type(err).__name__}: {err}" if err is not None else f"{name}: circuit open"
+            for name, err in attempts
+        )
+        super().__init__(f"All providers failed ({trace})")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker. Opens after `failure_threshold` transient
+    failures and lets a trial call through once `recovery_timeout` has elapsed.
+    """
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        return time.monotonic() - self.opened_at >= self.recovery_timeout
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class FallbackLLMProvider(LLMProvider):
+    """
+    Tries an ordered list of providers, moving to the next one only on
+    transient errors (429, 5xx, timeouts). Auth and other 4xx errors are
+    raised immediately. Each delegate has its own circuit breaker so a
+    provider that keeps failing is skipped until its cooldown elapses.
+    """
+
+    def __init__(
+        self,
+        providers: list[LLMProvider],
+        failure_threshold: int = 3,
+        recovery_timeout: float = 60.0
+    ):
+        if not providers:
+            raise ValueError("FallbackLLMProvider needs at least one provider.")
+        self.providers = list(providers)
+        self._breakers = {
+            id(p): CircuitBreaker(failure_threshold, recovery_timeout) for p in self.providers
+        }
+
+    @property
+    def model_name(self) -> str:
+        return self.providers[0].model_name
+
+    def _candidates(self) -> list[LLMProvider]:
+        """Providers in the order they should be tried."""
+        return self.providers
+
+    def _record_success(self, provider: LLMProvider, elapsed: float) -> None:
+        self._breakers[id(provider)].record_success()
+
+    def _record_failure(self, provider: LLMProvider, exc: Exception) -> None:
+        self._breakers[id(provider)].record_failure()
+        logger.warning("Provider %s failed with transient error: %s", provider.model_name, exc)
+
+    async def acomplete(self, system_prompt: str, user_prompt: str) -> str:
+        attempts = []
+        for provider in self._candidates():
+            if not self._breakers[id(provider)].allow():
+                attempts.append((provider.model_name, None))
+                continue
+            start = time.monotonic()
+            try:
+                response = await provider.acomplete(system_prompt, user_prompt)
+            except Exception as e:
+                if not is_transient_error(e):
+                    raise
+                self._record_failure(provider, e)
+                attempts.append((provider.model_name, e))
+                continue
+            self._record_success(provider, time.monotonic() - start)
+            return response
+        raise AllProvidersFailedError(attempts)
+
+    def complete(self, system_prompt: str, user_prompt: str) -> str:
+        attempts = []
+        for provider in self._candidates():
+            if not self._breakers[id(provider)].allow():
+                attempts.append((provider.model_name, None))
+                continue
+            start = time.monotonic()
+            try:
+                response = provider.complete(system_prompt, user_prompt)
+            except Exception as e:
+                if not is_transient_error(e):
+                    raise
+                self._record_failure(provider, e)
+                attempts.append((provider.model_name, e))
+                continue
+            self._record_success(provider, time.monotonic() - start)
+            return response
+        raise AllProvidersFailedError(attempts)
+
+    async def aclose(self) -> None:
+        for provider in self.providers:
+            await provider.aclose()
+
+    def close(self) -> None:
+        for provider in self.providers:
+            provider.close()
@@ -1,4 +1,5 @@
 import os
+import threading
 from om_memory.providers.base import LLMProvider
 
 try:
@@ -7,6 +8,10 @@ try:
 except ImportError:
     HAS_GENAI = False
 
+# (api_key, model) -> GenerativeModel, shared across provider instances
+_GEMINI_CLIENTS: dict = {}
+_GEMINI_CLIENTS_LOCK = threading.Lock()
+
 
 class GeminiProvider(LLMProvider):
     """
@@ -30,8 +35,15 @@ class GeminiProvider(LLMProvider):
                 "Google API key is required. Pass api_key or set GOOGLE_API_KEY / GEMINI_API_KEY env var."
             )
         
-        genai.configure(api_key=self.api_key)
-        self._client = genai.GenerativeModel(self._model)
+        key = (self.api_key, self._model)
+        with _GEMINI_CLIENTS_LOCK:
+            client = _GEMINI_CLIENTS.get(key)
+            if client is None:
+                # genai.configure is process-global; the SDK has no per-model key
+                genai.configure(api_key=self.api_key)
+                client = genai.GenerativeModel(self._model)
+                _GEMINI_CLIENTS[key] = client
+        self._client = client
         
     @property
     def model_name(self) -> str:
@@ -18,23 +18,16 @@ class LiteLLMProvider(LLMProvider):
     def model_name(self) -> str:
         return self._model
         
-    def _build_messages(self, system_prompt: str, user_prompt: str) -> list[dict]:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": user_prompt})
-        return messages
-
     async def acomplete(self, system_prompt: str, user_prompt: str) -> str:
         response = await acompletion(
             model=self._model,
-            messages=self._build_messages(system_prompt, user_prompt)
+            messages=self.build_messages(system_prompt, user_prompt)
         )
         return response.choices[0].message.content or ""
 
     def complete(self, system_prompt: str, user_prompt: str) -> str:
         response = completion(
             model=self._model,
-            messages=self._build_messages(system_prompt, user_prompt)
+            messages=self.build_messages(system_prompt, user_prompt)
         )
         return response.choices[0].message.content or ""
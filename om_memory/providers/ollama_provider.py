@@ -1,51 +1,97 @@
-import httpx
+import json
+from typing import AsyncIterator
+
+from om_memory.providers._http import get_async_client, get_client
 from om_memory.providers.base import LLMProvider
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 class OllamaProvider(LLMProvider):
     """
     Ollama provider for local models using HTTPX.
+    
+    Requests go through the package-wide shared HTTP clients, so repeated
+    observer/reflector calls reuse pooled keep-alive connections.
     """
     
-    def __init__(self, model: str = "llama3.2", base_url: str = "http://localhost:11434"):
+    def __init__(self, model: str = "llama3.2", base_url: str = "http://localhost:11434", timeout: float = 60.0):
         self._model = model
         self.base_url = base_url.rstrip("/")
+        self.chat_url = f"{self.base_url}/api/chat"
+        self.timeout = timeout
         
     @property
     def model_name(self) -> str:
         return self._model
         
-    def _build_messages(self, system_prompt: str, user_prompt: str) -> list[dict]:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": user_prompt})
-        return messages
-        
-    def _build_payload(self, system_prompt: str, user_prompt: str) -> dict:
+    def _build_payload(self, system_prompt: str, user_prompt: str, stream: bool = False) -> dict:
         return {
             "model": self._model,
-            "messages": self._build_messages(system_prompt, user_prompt),
-            "stream": False
+            "messages": self.build_messages(system_prompt, user_prompt),
+            "stream": stream
         }
 
     async def acomplete(self, system_prompt: str, user_prompt: str) -> str:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/chat",
-                json=self._build_payload(system_prompt, user_prompt),
-                timeout=60.0
-            )
+        response = await get_async_client().post(
+            self.chat_url,
+            content=_dumps(self._build_payload(system_prompt, user_prompt)),
+            headers=_JSON_HEADERS,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = _loads(response.content)
+        return data.get("message", {}).get("content", "")
+
+    async def astream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        # Ollama streams newline-delimited JSON objects, one per chunk
+        async with get_async_client().stream(
+            "POST",
+            self.chat_url,
+            content=_dumps(self._build_payload(system_prompt, user_prompt, stream=True)),
+            headers=_JSON_HEADERS,
+            timeout=self.timeout
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-            return data.get("message", {}).get("content", "")
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = _loads(line)
+                content = data.get("message", {}).get("content")
+                if content:
+                    yield content
+                if data.get("done"):
+                    break
 
     def complete(self, system_prompt: str, user_prompt: str) -> str:
-        with httpx.Client() as client:
-            response = client.post(
-                f"{self.base_url}/api/chat",
-                json=self._build_payload(system_prompt, user_prompt),
-                timeout=60.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("message", {}).get("content", "")
+        response = get_client().post(
+            self.chat_url,
+            content=_dumps(self._build_payload(system_prompt, user_prompt)),
+            headers=_JSON_HEADERS,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = _loads(response.content)
+        return data.get("message", {}).get("content", "")
+
+    async def aclose(self) -> None:
+        # The HTTP clients are shared with every other provider instance;
+        # closing them here would break their in-flight requests. Tear them
+        # down with om_memory.providers._http.aclose_all() at shutdown.
+        pass
+
+    def close(self) -> None:
+        pass
@@ -1,4 +1,8 @@
+import asyncio
+import json
 import os
+from typing import AsyncIterator, Optional, Union
+
 from om_memory.providers.base import LLMProvider
 
 try:
@@ -12,36 +16,112 @@ class OpenAIProvider(LLMProvider):
     OpenAI provider using the official `openai` package.
     """
     
-    def __init__(self, model: str = "gpt-4o-mini", api_key: str = None):
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        api_key: str = None,
+        use_batch_api: bool = False,
+        batch_poll_interval: float = 30.0
+    ):
         self._model = model
+        # The Batch API is half price but may take up to 24h, so it is opt-in
+        self.use_batch_api = use_batch_api
+        self.batch_poll_interval = batch_poll_interval
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Pass api_key or set OPENAI_API_KEY env var.")
             
         self.async_client = AsyncOpenAI(api_key=self.api_key)
-        self.sync_client = OpenAI(api_key=self.api_key)
+        # Created on first sync call so async-only users hold a single pool
+        self._sync_client = None
         
     @property
     def model_name(self) -> str:
         return self._model
         
-    def _build_messages(self, system_prompt: str, user_prompt: str) -> list[dict]:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": user_prompt})
-        return messages
-
+    @property
+    def sync_client(self):
+        if self._sync_client is None:
+            self._sync_client = OpenAI(api_key=self.api_key)
+        return self._sync_client
+        
     async def acomplete(self, system_prompt: str, user_prompt: str) -> str:
         response = await self.async_client.chat.completions.create(
             model=self._model,
-            messages=self._build_messages(system_prompt, user_prompt)
+            messages=self.build_messages(system_prompt, user_prompt)
         )
         return response.choices[0].message.content or ""
 
+    async def astream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        stream = await self.async_client.chat.completions.create(
+            model=self._model,
+            messages=self.build_messages(system_prompt, user_prompt),
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     def complete(self, system_prompt: str, user_prompt: str) -> str:
         response = self.sync_client.chat.completions.create(
             model=self._model,
-            messages=self._build_messages(system_prompt, user_prompt)
+            messages=self.build_messages(system_prompt, user_prompt)
         )
         return response.choices[0].message.content or ""
+
+    async def aclose(self) -> None:
+        await self.async_client.close()
+        self.close()
+
+    def close(self) -> None:
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    async def abatch_complete(
+        self,
+        pairs: list[tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> list[Union[str, Exception]]:
+        if not self.use_batch_api:
+            return await super().abatch_complete(pairs, max_concurrency=max_concurrency, semaphore=semaphore)
+            
+        lines = [
+            json.dumps({
+                "custom_id": f"req-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": self._model, "messages": self.build_messages(s, u)}
+            })
+            for i, (s, u) in enumerate(pairs)
+        ]
+        batch_file = await self.async_client.files.create(
+            file=("om_batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = await self.async_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await self.async_client.batches.retrieve(batch.id)
+            
+        results: list[Union[str, Exception]] = [
+            RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+        ] * len(pairs)
+        if batch.output_file_id:
+            content = await self.async_client.files.content(batch.output_file_id)
+            for line in content.text.splitlines():
+                if not line:
+                    continue
+                row = json.loads(line)
+                idx = int(row["custom_id"].split("-", 1)[1])
+                response = row.get("response") or {}
+                if response.get("status_code") == 200:
+                    results[idx] = response["body"]["choices"][0]["message"]["content"] or ""
+                else:
+                    results[idx] = RuntimeError(str(row.get("error") or response.get("body")))
+        return results
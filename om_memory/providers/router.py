@@ -0,0 +1,55 @@
+from collections import deque
+from typing import Optional
+
+from om_memory.providers.base import LLMProvider
+from om_memory.providers.fallback import FallbackLLMProvider
+
+
+class RouterProvider(FallbackLLMProvider):
+    """
+    Routes calls across providers that can serve the same workload.
+
+    strategy="ordered" keeps the list order (plain fallback chain).
+    strategy="latency" tries the provider with the lowest EWMA latency first;
+    providers with no samples yet are tried before measured ones so every
+    delegate gets a baseline. Failures still go through the circuit breakers,
+    so a slow or failing provider is deprioritized rather than retried.
+    """
+
+    def __init__(
+        self,
+        providers: list[LLMProvider],
+        strategy: str = "latency",
+        alpha: float = 0.2,
+        window: int = 32,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 60.0
+    ):
+        if strategy not in ("latency", "ordered"):
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        super().__init__(providers, failure_threshold, recovery_timeout)
+        self.strategy = strategy
+        self.alpha = alpha
+        self._ewma: dict[int, Optional[float]] = {id(p): None for p in self.providers}
+        self._latencies: dict[int, deque] = {id(p): deque(maxlen=window) for p in self.providers}
+
+    def _candidates(self) -> list[LLMProvider]:
+        if self.strategy == "ordered":
+            return self.providers
+        # Stable sort: unmeasured providers (-1) first, then by EWMA latency
+        return sorted(self.providers, key=lambda p: self._ewma[id(p)] if self._ewma[id(p)] is not None else -1.0)
+
+    def _record_success(self, provider: LLMProvider, elapsed: float) -> None:
+        super()._record_success(provider, elapsed)
+        observed_ms = elapsed * 1000
+        key = id(provider)
+        self._latencies[key].append(observed_ms)
+        prev = self._ewma[key]
+        self._ewma[key] = observed_ms if prev is None else (1 - self.alpha) * prev + self.alpha * observed_ms
+
+    def latency_stats(self) -> dict[str, dict]:
+        """EWMA and recent samples (ms) per provider, keyed by model name."""
+        return {
+            p.model_name: {"ewma_ms": self._ewma[id(p)], "recent_ms": list(self._latencies[id(p)])}
+            for p in self.providers
+        }
@@ -1,12 +1,18 @@
+from collections import OrderedDict
 from datetime import datetime, timezone
+from itertools import chain
 
 from om_memory.models import Observation, OMConfig
 from om_memory.providers.base import LLMProvider
+from om_memory.providers.concurrency import get_semaphore
 from om_memory.observability.callbacks import CallbackManager, OMEvent, EventType
 from om_memory.token_counter import TokenCounter
 from om_memory.prompts.reflector_prompt import REFLECTOR_SYSTEM_PROMPT
 from om_memory.parsing import parse_observations
 
+# Per-thread reflection state is kept for this many recently reflected threads
+_MAX_TRACKED_THREADS = 1024
+
 
 class Reflector:
     """
@@ -17,47 +23,101 @@ class Reflector:
         self.provider = provider
         self.config = config
         self.token_counter = token_counter
+        # The system prompt is constant, so tokenize it once
+        self._sys_tokens = token_counter.count(REFLECTOR_SYSTEM_PROMPT)
+        # thread_id -> fingerprint of the last reflection's output (LRU)
+        self._last_reflected: "OrderedDict[str, int]" = OrderedDict()
+        # thread_id -> ids of the observations the last reflection produced (LRU)
+        self._reflected_ids: "OrderedDict[str, frozenset[str]]" = OrderedDict()
         
-    async def areflect(
+    @staticmethod
+    def _remember(cache: OrderedDict, thread_id: str, value) -> None:
+        cache[thread_id] = value
+        cache.move_to_end(thread_id)
+        while len(cache) > _MAX_TRACKED_THREADS:
+            cache.popitem(last=False)
+        
+    @staticmethod
+    def _fingerprint(observations: list[Observation]) -> int:
+        return hash(tuple((o.priority, o.observation_date, o.content) for o in observations))
+        
+    def _skip_reason(self, thread_id: str, observations: list[Observation], input_tokens: int):
+        """Why this pass should not call the LLM, or None to run it."""
+        if input_tokens < self.config.reflect_min_tokens:
+            return "below_min_tokens"
+        if self._last_reflected.get(thread_id) == self._fingerprint(observations):
+            return "unchanged"
+        return None
+        
+    def _split(self, thread_id: str, observations: list[Observation]) -> tuple[list[Observation], list[Observation]]:
+        """
+        Split into (base, new). The base is the previous reflection's output;
+        both go to the LLM, framed as an existing summary to merge the new
+        observations into. With no known prior reflection the base is empty.
+        """
+        reflected = self._reflected_ids.get(thread_id)
+        if not self.config.incremental_reflection or not reflected:
+            return [], observations
+        base = [o for o in observations if o.id in reflected]
+        if not base or len(base) == len(observations):
+            return [], observations
+        return base, [o for o in observations if o.id not in reflected]
+        
+    def _emit_skipped(self, callbacks: CallbackManager, thread_id: str, reason: str, input_tokens: int):
+        if callbacks:
+            callbacks.emit(OMEvent(
+                type=EventType.REFLECTOR_SKIPPED,
+                thread_id=thread_id,
+                timestamp=datetime.now(timezone.utc),
+                data={"reason": reason, "input_tokens": input_tokens}
+            ))
+        
+    @staticmethod
+    def _format_lines(observations: list[Observation]) -> str:
+        # Formatted by hand; strftime is the slowest part of this loop
+        lines = []
+        for o in observations:
+            d = o.observation_date
+            lines.append(
+                f"{o.priority.value} [{d.year:04d}-{d.month:02d}-{d.day:02d} {d.hour:02d}:{d.minute:02d}] {o.content}"
+            )
+        return "\n".join(lines)
+        
+    def _build_user_prompt(self, observations: list[Observation], base: list[Observation] = ()) -> str:
+        if not base:
+            return "Current Observations:\n" + self._format_lines(observations) + "\n"
+        return (
+            "Existing Summary:\n" + self._format_lines(base) + "\n\n"
+            "New Observations:\n" + self._format_lines(observations) + "\n\n"
+            "Merge the new observations into the existing summary and output the full updated summary.\n"
+        )
+        
+    def _emit_error(self, callbacks: CallbackManager, thread_id: str, error: Exception):
+        if callbacks:
+            callbacks.emit(OMEvent(type=EventType.REFLECTOR_ERROR, thread_id=thread_id, timestamp=datetime.now(timezone.utc), data={"error": str(error)}))
+        
+    def _finish(
         self,
         thread_id: str,
         observations: list[Observation],
+        llm_response: str,
+        input_tokens: int,
         callbacks: CallbackManager = None,
         resource_id: str = None,
     ) -> list[Observation]:
-        
-        if callbacks:
-            callbacks.emit(OMEvent(type=EventType.REFLECTOR_STARTED, thread_id=thread_id, timestamp=datetime.now(timezone.utc), data={}))
-            
-        if not observations:
-            return []
-            
-        system_prompt = REFLECTOR_SYSTEM_PROMPT
-        
-        user_prompt = "Current Observations:\n"
-        for o in observations:
-            user_prompt += f"{o.priority.value} [{o.observation_date.strftime('%Y-%m-%d %H:%M')}] {o.content}\n"
-            
-        input_tokens = self.token_counter.count(system_prompt + "\n" + user_prompt)
-        
-        try:
-            llm_response = await self.provider.acomplete(system_prompt, user_prompt)
-        except Exception as e:
-            if callbacks:
-                callbacks.emit(OMEvent(type=EventType.REFLECTOR_ERROR, thread_id=thread_id, timestamp=datetime.now(timezone.utc), data={"error": str(e)}))
-            return observations  # Return unchanged on error
-            
         output_tokens = self.token_counter.count(llm_response)
         
-        all_source_message_ids = []
-        for o in observations:
-            all_source_message_ids.extend(o.source_message_ids)
-        all_source_message_ids = list(set(all_source_message_ids))
+        # Order-preserving dedup of every source message id
+        all_source_message_ids = list(dict.fromkeys(
+            chain.from_iterable(o.source_message_ids for o in observations)
+        ))
         
         # Use shared parsing utility
         new_observations = parse_observations(
             llm_response, thread_id, all_source_message_ids, resource_id=resource_id
         )
+        self._remember(self._last_reflected, thread_id, self._fingerprint(new_observations))
+        self._remember(self._reflected_ids, thread_id, frozenset(o.id for o in new_observations))
         
         if callbacks:
             callbacks.emit(OMEvent(
@@ -73,3 +133,100 @@ class Reflector:
             ))
             
         return new_observations
+        
+    async def areflect(
+        self,
+        thread_id: str,
+        observations: list[Observation],
+        callbacks: CallbackManager = None,
+        resource_id: str = None,
+    ) -> list[Observation]:
+        
+        if callbacks:
+            callbacks.emit(OMEvent(type=EventType.REFLECTOR_STARTED, thread_id=thread_id, timestamp=datetime.now(timezone.utc), data={}))
+            
+        if not observations:
+            return []
+            
+        system_prompt = REFLECTOR_SYSTEM_PROMPT
+        base, new = self._split(thread_id, observations)
+        user_prompt = self._build_user_prompt(new, base)
+            
+        input_tokens = self._sys_tokens + self.token_counter.count(user_prompt) + 1
+        
+        skip_reason = self._skip_reason(thread_id, observations, input_tokens)
+        if skip_reason:
+            self._emit_skipped(callbacks, thread_id, skip_reason, input_tokens)
+            return observations
+        
+        try:
+            chunks = []
+            async with get_semaphore(self.config):
+                async for chunk in self.provider.astream(system_prompt, user_prompt):
+                    chunks.append(chunk)
+            llm_response = "".join(chunks)
+        except Exception as e:
+            self._emit_error(callbacks, thread_id, e)
+            return observations  # Return unchanged on error
+            
+        return self._finish(thread_id, observations, llm_response, input_tokens, callbacks, resource_id)
+
+    async def areflect_many(
+        self,
+        batches: list[tuple[str, list[Observation]]],
+        callbacks: CallbackManager = None,
+        resource_id: str = None,
+        max_concurrency: int = None,
+    ) -> list[list[Observation]]:
+        """
+        Reflect several threads in one pass.
+        
+        Prompts are sent through `provider.abatch_complete`, so providers with a
+        native batch API can submit them together; the default runs them
+        concurrently under the shared `config.max_inflight_llm` cap, and at most
+        `max_concurrency` at a time when given. Results are returned
+        in input order. A thread whose call failed gets its observations back
+        unchanged, as with `areflect`.
+        """
+        system_prompt = REFLECTOR_SYSTEM_PROMPT
+        results: list[list[Observation]] = [[] for _ in batches]
+        pending = []
+        user_prompts = []
+        for i, (thread_id, observations) in enumerate(batches):
+            if callbacks:
+                callbacks.emit(OMEvent(type=EventType.REFLECTOR_STARTED, thread_id=thread_id, timestamp=datetime.now(timezone.utc), data={}))
+            if not observations:
+                continue
+            base, new = self._split(thread_id, observations)
+            user_prompt = self._build_user_prompt(new, base)
+            input_tokens = self._sys_tokens + self.token_counter.count(user_prompt) + 1
+            skip_reason = self._skip_reason(thread_id, observations, input_tokens)
+            if skip_reason:
+                self._emit_skipped(callbacks, thread_id, skip_reason, input_tokens)
+                results[i] = observations
+                continue
+            pending.append(i)
+            user_prompts.append(user_prompt)
+                
+        if not pending:
+            return results
+        
+        try:
+            responses = await self.provider.abatch_complete(
+                [(system_prompt, u) for u in user_prompts],
+                max_concurrency=max_concurrency,
+                semaphore=get_semaphore(self.config),
+            )
+        except Exception as e:
+            responses = [e] * len(pending)
+            
+        for i, user_prompt, response in zip(pending, user_prompts, responses):
+            thread_id, observations = batches[i]
+            if isinstance(response, BaseException):
+                self._emit_error(callbacks, thread_id, response)
+                results[i] = observations
+                continue
+            input_tokens = self._sys_tokens + self.token_counter.count(user_prompt) + 1
+            results[i] = self._finish(thread_id, observations, response, input_tokens, callbacks, resource_id)
+            
+        return results
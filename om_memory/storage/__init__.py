@@ -1,5 +1,6 @@
 from om_memory.storage.base import StorageBackend
 from om_memory.storage.sqlite import SQLiteStorage
+from om_memory.storage.sharded import ShardedSQLiteStorage
 from om_memory.storage.memory import InMemoryStorage
 from om_memory.storage.postgres import PostgresStorage
 from om_memory.storage.mongodb import MongoDBStorage
@@ -8,6 +9,7 @@ from om_memory.storage.redis_store import RedisStorage
 __all__ = [
     "StorageBackend",
     "SQLiteStorage",
+    "ShardedSQLiteStorage",
     "InMemoryStorage",
     "PostgresStorage",
     "MongoDBStorage",
@@ -0,0 +1,35 @@
+from om_memory.storage.base import StorageBackend
+
+
+class NotImplementedStorage(StorageBackend):
+    """
+    Shared base for backends that can be configured but not used yet.
+    Every data method raises NotImplementedError; lifecycle methods are no-ops.
+    """
+
+    def __init__(self, connection_string: str = None):
+        self.connection_string = connection_string
+        # Note: Does NOT raise on instantiation. Raises on actual usage.
+
+    def _not_implemented(self, *args, **kwargs):
+        raise NotImplementedError(
+            f"{type(self).__name__} is not yet implemented. "
+            "Use SQLiteStorage or InMemoryStorage instead."
+        )
+
+    async def _anot_implemented(self, *args, **kwargs):
+        # A coroutine function, so the a* methods raise on await like real ones
+        self._not_implemented()
+
+    save_messages = get_messages = delete_messages = _not_implemented
+    save_observations = get_observations = _not_implemented
+    update_observations = delete_observations = replace_observations = _not_implemented
+
+    asave_messages = aget_messages = adelete_messages = _anot_implemented
+    asave_observations = aget_observations = _anot_implemented
+    aupdate_observations = adelete_observations = areplace_observations = _anot_implemented
+
+    async def ainitialize(self) -> None: pass
+    def initialize(self) -> None: pass
+    async def aclose(self) -> None: pass
+    def close(self) -> None: pass
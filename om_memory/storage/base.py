@@ -4,6 +4,9 @@ from om_memory.models import Message, Observation, OMStats
 class StorageBackend(ABC):
     """
     Abstract interface for storing observations and messages.
+
+    Backends store `token_count` as given; callers fill it in before saving
+    so reads never have to re-tokenize.
     """
     
     # Message operations
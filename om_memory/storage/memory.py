@@ -1,110 +1,131 @@
+import bisect
+from collections import defaultdict
 from typing import Dict, List
 from om_memory.models import Message, Observation
 from om_memory.storage.base import StorageBackend
 
+def _message_time(msg: Message):
+    return msg.timestamp
+
 class InMemoryStorage(StorageBackend):
     """
     Simple dict-based storage. Good for testing and demos. No persistence.
     """
     def __init__(self):
-        self._messages: Dict[str, List[Message]] = {}
-        self._observations: Dict[str, List[Observation]] = {}
-        self._resource_observations: Dict[str, List[Observation]] = {}
+        # Per-thread message lists are kept sorted by timestamp on insert
+        self._messages: Dict[str, List[Message]] = defaultdict(list)
+        # thread_id -> {observation id -> Observation}
+        self._observations: Dict[str, Dict[str, Observation]] = defaultdict(dict)
+        # resource_id -> {observation id -> Observation}, kept in step with _observations
+        self._resource_observations: Dict[str, Dict[str, Observation]] = defaultdict(dict)
+        # id -> thread_id, so deletes only touch the threads that hold the ids
+        self._message_threads: Dict[str, str] = {}
+        self._observation_threads: Dict[str, str] = {}
         
     async def asave_messages(self, messages: list[Message]) -> None:
         self.save_messages(messages)
         
     def save_messages(self, messages: list[Message]) -> None:
         for msg in messages:
-            if msg.thread_id not in self._messages:
-                self._messages[msg.thread_id] = []
-            self._messages[msg.thread_id].append(msg)
+            self._message_threads[msg.id] = msg.thread_id
+            msgs = self._messages[msg.thread_id]
+            if not msgs or msgs[-1].timestamp <= msg.timestamp:
+                msgs.append(msg)
+            else:
+                bisect.insort(msgs, msg, key=_message_time)
             
     async def aget_messages(self, thread_id: str, limit: int = None) -> list[Message]:
         return self.get_messages(thread_id, limit)
         
     def get_messages(self, thread_id: str, limit: int = None) -> list[Message]:
         msgs = self._messages.get(thread_id, [])
-        msgs = sorted(msgs, key=lambda m: m.timestamp)
-        return msgs[-limit:] if limit else msgs
+        return msgs[-limit:] if limit else list(msgs)
         
     async def adelete_messages(self, message_ids: list[str]) -> None:
         self.delete_messages(message_ids)
         
     def delete_messages(self, message_ids: list[str]) -> None:
-        ids = set(message_ids)
-        for t_id, msgs in self._messages.items():
-            self._messages[t_id] = [m for m in msgs if m.id not in ids]
+        by_thread: Dict[str, set] = defaultdict(set)
+        for msg_id in message_ids:
+            t_id = self._message_threads.pop(msg_id, None)
+            if t_id is not None:
+                by_thread[t_id].add(msg_id)
+        for t_id, ids in by_thread.items():
+            self._messages[t_id] = [m for m in self._messages[t_id] if m.id not in ids]
             
     async def asave_observations(self, observations: list[Observation]) -> None:
         self.save_observations(observations)
         
+    def _unindex_observation(self, obs_id: str) -> None:
+        t_id = self._observation_threads.pop(obs_id, None)
+        if t_id is None:
+            return
+        old = self._observations[t_id].pop(obs_id, None)
+        if old is not None and old.resource_id:
+            by_id = self._resource_observations.get(old.resource_id)
+            if by_id:
+                by_id.pop(obs_id, None)
+        
     def save_observations(self, observations: list[Observation]) -> None:
         for obs in observations:
-            if obs.thread_id not in self._observations:
-                self._observations[obs.thread_id] = []
-            # Upsert: replace existing observation with same ID, or append
-            obs_list = self._observations[obs.thread_id]
-            replaced = False
-            for i, existing in enumerate(obs_list):
-                if existing.id == obs.id:
-                    obs_list[i] = obs
-                    replaced = True
-                    break
-            if not replaced:
-                obs_list.append(obs)
+            # Upsert: drop any stored copy (it may sit under another thread or
+            # resource), then add
+            self._unindex_observation(obs.id)
+            self._observation_threads[obs.id] = obs.thread_id
+            self._observations[obs.thread_id][obs.id] = obs
+            if obs.resource_id:
+                self._resource_observations[obs.resource_id][obs.id] = obs
             
     async def aget_observations(self, thread_id: str) -> list[Observation]:
         return self.get_observations(thread_id)
         
     def get_observations(self, thread_id: str) -> list[Observation]:
-        return sorted(self._observations.get(thread_id, []), key=lambda o: o.observation_date)
+        obs_by_id = self._observations.get(thread_id)
+        if not obs_by_id:
+            return []
+        return sorted(obs_by_id.values(), key=lambda o: o.observation_date)
         
     async def aupdate_observations(self, observations: list[Observation]) -> None:
         self.update_observations(observations)
         
     def update_observations(self, observations: list[Observation]) -> None:
-        for obs in observations:
-            obs_list = self._observations.get(obs.thread_id, [])
-            for i, existing in enumerate(obs_list):
-                if existing.id == obs.id:
-                    obs_list[i] = obs
-                    break
+        # Update-only: ids that aren't stored are ignored
+        self.save_observations([
+            obs for obs in observations
+            if obs.id in self._observations.get(obs.thread_id, ())
+        ])
                     
     async def adelete_observations(self, observation_ids: list[str]) -> None:
         self.delete_observations(observation_ids)
         
     def delete_observations(self, observation_ids: list[str]) -> None:
-        ids = set(observation_ids)
-        for t_id, obs_list in self._observations.items():
-            self._observations[t_id] = [o for o in obs_list if o.id not in ids]
+        for obs_id in observation_ids:
+            self._unindex_observation(obs_id)
             
     async def areplace_observations(self, thread_id: str, observations: list[Observation]) -> None:
         self.replace_observations(thread_id, observations)
         
     def replace_observations(self, thread_id: str, observations: list[Observation]) -> None:
-        self._observations[thread_id] = observations
+        for obs_id in list(self._observations.get(thread_id, ())):
+            self._unindex_observation(obs_id)
+        self.save_observations(observations)
 
     # Resource-scoped operations
     async def aget_resource_observations(self, resource_id: str) -> list[Observation]:
         return self.get_resource_observations(resource_id)
     
     def get_resource_observations(self, resource_id: str) -> list[Observation]:
-        return sorted(
-            self._resource_observations.get(resource_id, []),
-            key=lambda o: o.observation_date,
-        )
+        obs_by_id = self._resource_observations.get(resource_id)
+        if not obs_by_id:
+            return []
+        return sorted(obs_by_id.values(), key=lambda o: o.observation_date)
     
     async def asave_resource_observations(self, observations: list[Observation]) -> None:
         self.save_resource_observations(observations)
     
     def save_resource_observations(self, observations: list[Observation]) -> None:
-        for obs in observations:
-            rid = obs.resource_id
-            if rid:
-                if rid not in self._resource_observations:
-                    self._resource_observations[rid] = []
-                self._resource_observations[rid].append(obs)
+        # Same table as thread observations, as in the SQL backends
+        self.save_observations(observations)
 
     async def ainitialize(self) -> None:
         self.initialize()
@@ -1,44 +1,312 @@
+import asyncio
+import os
+from collections import defaultdict
+
 from om_memory.models import Message, Observation
 from om_memory.storage.base import StorageBackend
 
+try:
+    import redis
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
 
 class RedisStorage(StorageBackend):
     """
     Redis storage backend using redis-py.
-    
-    Status: Not yet implemented. Instantiation is allowed for configuration
-    purposes, but calling any storage method will raise NotImplementedError.
-    
-    For a working backend, use SQLiteStorage or InMemoryStorage.
+
+    Layout (all keys under `prefix`):
+        msgs:{thread_id}       ZSET  message id, scored by timestamp
+        msg:{thread_id}        HASH  message id -> message JSON
+        msg_thread             HASH  message id -> thread_id
+        obs:{thread_id}        HASH  observation id -> observation JSON
+        obs_thread             HASH  observation id -> thread_id
+        res_threads:{resource} SET   thread ids holding the resource's observations
+
+    Writes are queued on a pipeline so each batch costs one round trip.
+    Instantiation does not connect; redis-py is only required on first use.
     """
-    
-    def __init__(self, connection_string: str = None):
-        self.connection_string = connection_string
-        # Note: Does NOT raise on instantiation. Raises on actual usage.
-
-    def _not_implemented(self):
-        raise NotImplementedError(
-            "RedisStorage is not yet implemented. "
-            "Use SQLiteStorage or InMemoryStorage instead."
-        )
-
-    async def asave_messages(self, messages: list[Message]) -> None: self._not_implemented()
-    def save_messages(self, messages: list[Message]) -> None: self._not_implemented()
-    async def aget_messages(self, thread_id: str, limit: int = None) -> list[Message]: self._not_implemented()
-    def get_messages(self, thread_id: str, limit: int = None) -> list[Message]: self._not_implemented()
-    async def adelete_messages(self, message_ids: list[str]) -> None: self._not_implemented()
-    def delete_messages(self, message_ids: list[str]) -> None: self._not_implemented()
-    async def asave_observations(self, observations: list[Observation]) -> None: self._not_implemented()
-    def save_observations(self, observations: list[Observation]) -> None: self._not_implemented()
-    async def aget_observations(self, thread_id: str) -> list[Observation]: self._not_implemented()
-    def get_observations(self, thread_id: str) -> list[Observation]: self._not_implemented()
-    async def aupdate_observations(self, observations: list[Observation]) -> None: self._not_implemented()
-    def update_observations(self, observations: list[Observation]) -> None: self._not_implemented()
-    async def adelete_observations(self, observation_ids: list[str]) -> None: self._not_implemented()
-    def delete_observations(self, observation_ids: list[str]) -> None: self._not_implemented()
-    async def areplace_observations(self, thread_id: str, observations: list[Observation]) -> None: self._not_implemented()
-    def replace_observations(self, thread_id: str, observations: list[Observation]) -> None: self._not_implemented()
-    async def ainitialize(self) -> None: pass
-    def initialize(self) -> None: pass
-    async def aclose(self) -> None: pass
-    def close(self) -> None: pass
+
+    def __init__(self, connection_string: str = None, prefix: str = "om"):
+        self.connection_string = connection_string or os.environ.get("OM_REDIS_URL") or "redis://localhost:6379/0"
+        self.prefix = prefix
+        self._client = None
+        # redis.asyncio connections are bound to the loop that opened them,
+        # and the sync wrappers run each call on a new loop.
+        self._aclients: dict = {}
+
+    # --- Connections ---
+
+    @staticmethod
+    def _require_redis() -> None:
+        if not HAS_REDIS:
+            raise ImportError(
+                "redis is required for RedisStorage. "
+                "Install it with: pip install om-memory[redis]"
+            )
+
+    def _sync(self):
+        if self._client is None:
+            self._require_redis()
+            self._client = redis.Redis.from_url(self.connection_string, decode_responses=True)
+        return self._client
+
+    def _async(self):
+        loop = asyncio.get_running_loop()
+        client = self._aclients.get(loop)
+        if client is None:
+            self._require_redis()
+            # Clients from finished loops can't be awaited closed; drop them.
+            for old in [l for l in self._aclients if l.is_closed()]:
+                del self._aclients[old]
+            client = aioredis.Redis.from_url(self.connection_string, decode_responses=True)
+            self._aclients[loop] = client
+        return client
+
+    # --- Keys ---
+
+    def _key(self, kind: str, name: str = None) -> str:
+        return f"{self.prefix}:{kind}:{name}" if name is not None else f"{self.prefix}:{kind}"
+
+    # --- Pipeline builders (shared by the sync and async paths) ---
+
+    def _queue_save_messages(self, pipe, messages: list[Message]) -> None:
+        for msg in messages:
+            pipe.zadd(self._key("msgs", msg.thread_id), {msg.id: msg.timestamp.timestamp()})
+            pipe.hset(self._key("msg", msg.thread_id), msg.id, msg.model_dump_json())
+        pipe.hset(self._key("msg_thread"), mapping={msg.id: msg.thread_id for msg in messages})
+
+    def _queue_delete_messages(self, pipe, message_ids: list[str], thread_ids: list) -> None:
+        by_thread = defaultdict(list)
+        for msg_id, t_id in zip(message_ids, thread_ids):
+            if t_id is not None:
+                by_thread[t_id].append(msg_id)
+        for t_id, ids in by_thread.items():
+            pipe.zrem(self._key("msgs", t_id), *ids)
+            pipe.hdel(self._key("msg", t_id), *ids)
+        pipe.hdel(self._key("msg_thread"), *message_ids)
+
+    def _queue_save_observations(self, pipe, observations: list[Observation], prev_threads: list) -> None:
+        for obs, prev in zip(observations, prev_threads):
+            if prev is not None and prev != obs.thread_id:
+                pipe.hdel(self._key("obs", prev), obs.id)
+            pipe.hset(self._key("obs", obs.thread_id), obs.id, obs.model_dump_json())
+            if obs.resource_id:
+                pipe.sadd(self._key("res_threads", obs.resource_id), obs.thread_id)
+        pipe.hset(self._key("obs_thread"), mapping={obs.id: obs.thread_id for obs in observations})
+
+    def _queue_update_observations(self, pipe, observations: list[Observation], threads: list) -> None:
+        for obs, t_id in zip(observations, threads):
+            # Update-only: ids that aren't stored are ignored
+            if t_id is None:
+                continue
+            pipe.hset(self._key("obs", t_id), obs.id, obs.model_dump_json())
+            if obs.resource_id:
+                pipe.sadd(self._key("res_threads", obs.resource_id), t_id)
+
+    def _queue_delete_observations(self, pipe, observation_ids: list[str], thread_ids: list) -> None:
+        for obs_id, t_id in zip(observation_ids, thread_ids):
+            if t_id is not None:
+                pipe.hdel(self._key("obs", t_id), obs_id)
+        pipe.hdel(self._key("obs_thread"), *observation_ids)
+
+    def _queue_replace_observations(
+        self, pipe, thread_id: str, observations: list[Observation], stale: list[str], prev_threads: list
+    ) -> None:
+        pipe.delete(self._key("obs", thread_id))
+        if stale:
+            pipe.hdel(self._key("obs_thread"), *stale)
+        if observations:
+            self._queue_save_observations(pipe, observations, prev_threads)
+
+    # --- Decoding ---
+
+    @staticmethod
+    def _decode_messages(raw: list) -> list[Message]:
+        return [Message.model_validate_json(r) for r in raw if r is not None]
+
+    @staticmethod
+    def _decode_observations(raw, resource_id: str = None) -> list[Observation]:
+        obs = [Observation.model_validate_json(r) for r in raw if r is not None]
+        if resource_id is not None:
+            obs = [o for o in obs if o.resource_id == resource_id]
+        obs.sort(key=lambda o: o.observation_date)
+        return obs
+
+    # --- Sync Methods ---
+
+    def save_messages(self, messages: list[Message]) -> None:
+        if not messages:
+            return
+        pipe = self._sync().pipeline(transaction=False)
+        self._queue_save_messages(pipe, messages)
+        pipe.execute()
+
+    def get_messages(self, thread_id: str, limit: int = None) -> list[Message]:
+        client = self._sync()
+        ids = client.zrange(self._key("msgs", thread_id), -limit if limit else 0, -1)
+        if not ids:
+            return []
+        return self._decode_messages(client.hmget(self._key("msg", thread_id), ids))
+
+    def delete_messages(self, message_ids: list[str]) -> None:
+        if not message_ids:
+            return
+        client = self._sync()
+        thread_ids = client.hmget(self._key("msg_thread"), message_ids)
+        pipe = client.pipeline(transaction=False)
+        self._queue_delete_messages(pipe, message_ids, thread_ids)
+        pipe.execute()
+
+    def save_observations(self, observations: list[Observation]) -> None:
+        if not observations:
+            return
+        client = self._sync()
+        prev = client.hmget(self._key("obs_thread"), [o.id for o in observations])
+        pipe = client.pipeline(transaction=False)
+        self._queue_save_observations(pipe, observations, prev)
+        pipe.execute()
+
+    def get_observations(self, thread_id: str) -> list[Observation]:
+        return self._decode_observations(self._sync().hvals(self._key("obs", thread_id)))
+
+    def update_observations(self, observations: list[Observation]) -> None:
+        if not observations:
+            return
+        client = self._sync()
+        threads = client.hmget(self._key("obs_thread"), [o.id for o in observations])
+        pipe = client.pipeline(transaction=False)
+        self._queue_update_observations(pipe, observations, threads)
+        pipe.execute()
+
+    def delete_observations(self, observation_ids: list[str]) -> None:
+        if not observation_ids:
+            return
+        client = self._sync()
+        thread_ids = client.hmget(self._key("obs_thread"), observation_ids)
+        pipe = client.pipeline(transaction=False)
+        self._queue_delete_observations(pipe, observation_ids, thread_ids)
+        pipe.execute()
+
+    def replace_observations(self, thread_id: str, observations: list[Observation]) -> None:
+        client = self._sync()
+        keep = {o.id for o in observations}
+        stale = [i for i in client.hkeys(self._key("obs", thread_id)) if i not in keep]
+        prev = client.hmget(self._key("obs_thread"), [o.id for o in observations]) if observations else []
+        # MULTI so readers never see the thread emptied mid-replace
+        pipe = client.pipeline(transaction=True)
+        self._queue_replace_observations(pipe, thread_id, observations, stale, prev)
+        pipe.execute()
+
+    def get_resource_observations(self, resource_id: str) -> list[Observation]:
+        client = self._sync()
+        thread_ids = client.smembers(self._key("res_threads", resource_id))
+        if not thread_ids:
+            return []
+        pipe = client.pipeline(transaction=False)
+        for t_id in thread_ids:
+            pipe.hvals(self._key("obs", t_id))
+        raw = [r for values in pipe.execute() for r in values]
+        return self._decode_observations(raw, resource_id)
+
+    def save_resource_observations(self, observations: list[Observation]) -> None:
+        self.save_observations(observations)
+
+    def initialize(self) -> None:
+        self._sync().ping()
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    # --- Async Methods ---
+
+    async def asave_messages(self, messages: list[Message]) -> None:
+        if not messages:
+            return
+        pipe = self._async().pipeline(transaction=False)
+        self._queue_save_messages(pipe, messages)
+        await pipe.execute()
+
+    async def aget_messages(self, thread_id: str, limit: int = None) -> list[Message]:
+        client = self._async()
+        ids = await client.zrange(self._key("msgs", thread_id), -limit if limit else 0, -1)
+        if not ids:
+            return []
+        return self._decode_messages(await client.hmget(self._key("msg", thread_id), ids))
+
+    async def adelete_messages(self, message_ids: list[str]) -> None:
+        if not message_ids:
+            return
+        client = self._async()
+        thread_ids = await client.hmget(self._key("msg_thread"), message_ids)
+        pipe = client.pipeline(transaction=False)
+        self._queue_delete_messages(pipe, message_ids, thread_ids)
+        await pipe.execute()
+
+    async def asave_observations(self, observations: list[Observation]) -> None:
+        if not observations:
+            return
+        client = self._async()
+        prev = await client.hmget(self._key("obs_thread"), [o.id for o in observations])
+        pipe = client.pipeline(transaction=False)
+        self._queue_save_observations(pipe, observations, prev)
+        await pipe.execute()
+
+    async def aget_observations(self, thread_id: str) -> list[Observation]:
+        return self._decode_observations(await self._async().hvals(self._key("obs", thread_id)))
+
+    async def aupdate_observations(self, observations: list[Observation]) -> None:
+        if not observations:
+            return
+        client = self._async()
+        threads = await client.hmget(self._key("obs_thread"), [o.id for o in observations])
+        pipe = client.pipeline(transaction=False)
+        self._queue_update_observations(pipe, observations, threads)
+        await pipe.execute()
+
+    async def adelete_observations(self, observation_ids: list[str]) -> None:
+        if not observation_ids:
+            return
+        client = self._async()
+        thread_ids = await client.hmget(self._key("obs_thread"), observation_ids)
+        pipe = client.pipeline(transaction=False)
+        self._queue_delete_observations(pipe, observation_ids, thread_ids)
+        await pipe.execute()
+
+    async def areplace_observations(self, thread_id: str, observations: list[Observation]) -> None:
+        client = self._async()
+        keep = {o.id for o in observations}
+        stale = [i for i in await client.hkeys(self._key("obs", thread_id)) if i not in keep]
+        prev = await client.hmget(self._key("obs_thread"), [o.id for o in observations]) if observations else []
+        pipe = client.pipeline(transaction=True)
+        self._queue_replace_observations(pipe, thread_id, observations, stale, prev)
+        await pipe.execute()
+
+    async def aget_resource_observations(self, resource_id: str) -> list[Observation]:
+        client = self._async()
+        thread_ids = await client.smembers(self._key("res_threads", resource_id))
+        if not thread_ids:
+            return []
+        pipe = client.pipeline(transaction=False)
+        for t_id in thread_ids:
+            pipe.hvals(self._key("obs", t_id))
+        raw = [r for values in await pipe.execute() for r in values]
+        return self._decode_observations(raw, resource_id)
+
+    async def asave_resource_observations(self, observations: list[Observation]) -> None:
+        await self.asave_observations(observations)
+
+    async def ainitialize(self) -> None:
+        await self._async().ping()
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        clients, self._aclients = self._aclients, {}
+        client = clients.get(loop)
+        if client is not None:
+            await client.aclose()
+        self.close()
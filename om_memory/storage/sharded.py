@@ -0,0 +1,149 @@
+import asyncio
+import heapq
+import os
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+from om_memory.models import Message, Observation
+from om_memory.storage.base import StorageBackend
+from om_memory.storage.sqlite import SQLiteStorage
+
+
+class ShardedSQLiteStorage(StorageBackend):
+    """
+    Partitions threads across several SQLite files, each with its own
+    connection and aiosqlite worker thread, so async writes to different
+    threads can run in parallel.
+
+    Every thread-keyed query goes to a single shard. Deletes by id and
+    resource-scoped reads fan out to all shards.
+
+    Usage:
+        storage = ShardedSQLiteStorage("om_memory.db", shards=4)
+        # -> om_memory.0.db, om_memory.1.db, ...
+        # ":memory:" gives one in-memory database per shard
+    """
+
+    def __init__(self, db_path: str = None, shards: int = 4):
+        if shards < 1:
+            raise ValueError("shards must be at least 1.")
+        if not db_path:
+            db_path = os.environ.get("OM_DATABASE_URL")
+        if not db_path:
+            om_dir = Path.home() / ".om_memory"
+            om_dir.mkdir(exist_ok=True)
+            db_path = str(om_dir / "om_memory.db")
+        if db_path == ":memory:":
+            # Each shard gets its own private in-memory database
+            self.shards = [SQLiteStorage(":memory:") for _ in range(shards)]
+            return
+        base, ext = os.path.splitext(db_path)
+        self.shards = [SQLiteStorage(f"{base}.{i}{ext or '.db'}") for i in range(shards)]
+
+    def _shard_for(self, thread_id: str) -> SQLiteStorage:
+        # crc32 rather than hash(): str hashes are salted per process, and a
+        # thread must map to the same file on every run.
+        return self.shards[zlib.crc32(thread_id.encode()) % len(self.shards)]
+
+    def _by_shard(self, items: list) -> dict:
+        groups = defaultdict(list)
+        for item in items:
+            groups[self._shard_for(item.thread_id)].append(item)
+        return groups
+
+    @staticmethod
+    def _merge_by_date(per_shard: list[list[Observation]]) -> list[Observation]:
+        return list(heapq.merge(*per_shard, key=lambda o: o.observation_date))
+
+    # --- Sync Methods ---
+
+    def save_messages(self, messages: list[Message]) -> None:
+        for shard, group in self._by_shard(messages).items():
+            shard.save_messages(group)
+
+    def get_messages(self, thread_id: str, limit: int = None) -> list[Message]:
+        return self._shard_for(thread_id).get_messages(thread_id, limit)
+
+    def delete_messages(self, message_ids: list[str]) -> None:
+        if not message_ids:
+            return
+        for shard in self.shards:
+            shard.delete_messages(message_ids)
+
+    def save_observations(self, observations: list[Observation]) -> None:
+        for shard, group in self._by_shard(observations).items():
+            shard.save_observations(group)
+
+    def get_observations(self, thread_id: str) -> list[Observation]:
+        return self._shard_for(thread_id).get_observations(thread_id)
+
+    def update_observations(self, observations: list[Observation]) -> None:
+        for shard, group in self._by_shard(observations).items():
+            shard.update_observations(group)
+
+    def delete_observations(self, observation_ids: list[str]) -> None:
+        if not observation_ids:
+            return
+        for shard in self.shards:
+            shard.delete_observations(observation_ids)
+
+    def replace_observations(self, thread_id: str, observations: list[Observation]) -> None:
+        self._shard_for(thread_id).replace_observations(thread_id, observations)
+
+    def get_resource_observations(self, resource_id: str) -> list[Observation]:
+        return self._merge_by_date([s.get_resource_observations(resource_id) for s in self.shards])
+
+    def save_resource_observations(self, observations: list[Observation]) -> None:
+        self.save_observations(observations)
+
+    def initialize(self) -> None:
+        for shard in self.shards:
+            shard.initialize()
+
+    def close(self) -> None:
+        for shard in self.shards:
+            shard.close()
+
+    # --- Async Methods ---
+
+    async def asave_messages(self, messages: list[Message]) -> None:
+        await asyncio.gather(*(s.asave_messages(g) for s, g in self._by_shard(messages).items()))
+
+    async def aget_messages(self, thread_id: str, limit: int = None) -> list[Message]:
+        return await self._shard_for(thread_id).aget_messages(thread_id, limit)
+
+    async def adelete_messages(self, message_ids: list[str]) -> None:
+        if not message_ids:
+            return
+        await asyncio.gather(*(s.adelete_messages(message_ids) for s in self.shards))
+
+    async def asave_observations(self, observations: list[Observation]) -> None:
+        await asyncio.gather(*(s.asave_observations(g) for s, g in self._by_shard(observations).items()))
+
+    async def aget_observations(self, thread_id: str) -> list[Observation]:
+        return await self._shard_for(thread_id).aget_observations(thread_id)
+
+    async def aupdate_observations(self, observations: list[Observation]) -> None:
+        await asyncio.gather(*(s.aupdate_observations(g) for s, g in self._by_shard(observations).items()))
+
+    async def adelete_observations(self, observation_ids: list[str]) -> None:
+        if not observation_ids:
+            return
+        await asyncio.gather(*(s.adelete_observations(observation_ids) for s in self.shards))
+
+    async def areplace_observations(self, thread_id: str, observations: list[Observation]) -> None:
+        await self._shard_for(thread_id).areplace_observations(thread_id, observations)
+
+    async def aget_resource_observations(self, resource_id: str) -> list[Observation]:
+        per_shard = await asyncio.gather(*(s.aget_resource_observations(resource_id) for s in self.shards))
+        return self._merge_by_date(per_shard)
+
+    async def asave_resource_observations(self, observations: list[Observation]) -> None:
+        await self.asave_observations(observations)
+
+    async def ainitialize(self) -> None:
+        await asyncio.gather(*(s.ainitialize() for s in self.shards))
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(s.aclose() for s in self.shards))
@@ -1,20 +1,197 @@
 import os
 import sqlite3
 import json
+import asyncio
+import itertools
+import threading
+from contextlib import asynccontextmanager, contextmanager, nullcontext, suppress
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
 import aiosqlite
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    _loads = orjson.loads
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
 from om_memory.storage.base import StorageBackend
 from om_memory.models import Message, Observation, Priority
 
+# Per-connection tuning. journal_mode=WAL is persistent in the database file,
+# so it is set once in initialize() instead of on every connection.
+# sqlite3 opens a transaction implicitly before the first INSERT/UPDATE/DELETE
+# of a write; IMMEDIATE takes the write lock right there, so writes don't need
+# a separate BEGIN statement (an extra aiosqlite thread round trip).
+_ISOLATION_LEVEL = "IMMEDIATE"
+
+# Refresh planner statistics with PRAGMA optimize after this many changed rows
+# on a connection, and again when it closes.
+_OPTIMIZE_EVERY = 1000
+
+# Async reads go through the writer until this many have run on one event
+# loop. The sync wrappers use a new loop per call, and opening a reader pool
+# for each of those would cost more than it saves.
+_READER_POOL_AFTER = 8
+
+# Room for every module-level statement plus the migration/DDL strings
+_CACHED_STATEMENTS = 256
+
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    # Read pages straight from the OS page cache instead of copying them
+    "PRAGMA mmap_size=268435456",
+)
+
+# Timestamps are stored as INTEGER microseconds since the Unix epoch (UTC).
+# Naive datetimes are taken to be UTC, matching the models' utcnow() default.
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _to_us(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _MICROSECOND
+
+def _from_us(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=us)
+
+def _iso_to_us(text):
+    return _to_us(datetime.fromisoformat(text)) if text else None
+
+# Async writes encode batches at least this large in a worker thread so the
+# event loop isn't blocked on serialization.
+_OFFLOAD_ROWS = 256
+
+_SQL_CREATE_MESSAGES = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT,
+    resource_id TEXT,
+    role TEXT,
+    content TEXT,
+    timestamp INTEGER,
+    token_count INTEGER,
+    metadata TEXT
+)
+"""
+_SQL_CREATE_OBSERVATIONS = """
+CREATE TABLE IF NOT EXISTS observations (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT,
+    resource_id TEXT,
+    observation_date INTEGER,
+    referenced_date INTEGER,
+    relative_date TEXT,
+    priority TEXT,
+    content TEXT,
+    source_message_ids TEXT,
+    token_count INTEGER
+)
+"""
+_SQL_CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(thread_id, timestamp)",
+    # Composite indexes let the ORDER BY observation_date reads walk the
+    # index in order instead of sorting the thread's rows.
+    "CREATE INDEX IF NOT EXISTS idx_obs_thread_date ON observations(thread_id, observation_date)",
+    "CREATE INDEX IF NOT EXISTS idx_obs_resource_date ON observations(resource_id, observation_date)",
+    # Superseded by the composite indexes above
+    "DROP INDEX IF EXISTS idx_observations_thread",
+    "DROP INDEX IF EXISTS idx_observations_resource",
+)
+
+# Statements are module constants so every call hits sqlite3's statement cache
+# with the identical string.
+_MSG_COLUMNS = "id, thread_id, resource_id, role, content, timestamp, token_count, metadata"
+_OBS_COLUMNS = "id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count"
+
+_SQL_INSERT_MSG = f"INSERT INTO messages ({_MSG_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+_SQL_SELECT_MSGS = f"SELECT {_MSG_COLUMNS} FROM messages WHERE thread_id = ? ORDER BY timestamp ASC"
+# Newest-first so LIMIT keeps the latest messages; callers reverse the rows.
+_SQL_SELECT_LATEST_MSGS = f"SELECT {_MSG_COLUMNS} FROM messages WHERE thread_id = ? ORDER BY timestamp DESC LIMIT ?"
+_OBS_UPSERT_COLUMNS = _OBS_COLUMNS.split(", ")[1:]
+# The WHERE clause skips the write (and its index maintenance) when an
+# existing row is unchanged, which is the common case on reflection.
+_SQL_INSERT_OBS = (
+    f"INSERT INTO observations ({_OBS_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{c}=excluded.{c}" for c in _OBS_UPSERT_COLUMNS)
+    + " WHERE "
+    + " OR ".join(f"{c} IS NOT excluded.{c}" for c in _OBS_UPSERT_COLUMNS)
+)
+_SQL_UPDATE_OBS = (
+    "UPDATE observations SET observation_date=?, referenced_date=?, relative_date=?, priority=?, "
+    "content=?, source_message_ids=?, token_count=?, resource_id=? WHERE id=?"
+)
+# Deletes by id bind a fixed number of parameters so there is exactly one SQL
+# string per table; a short final chunk is padded by repeating its last id.
+_DELETE_CHUNK = 64
+_SQL_DELETE_MSGS_CHUNK = f"DELETE FROM messages WHERE id IN ({', '.join(['?'] * _DELETE_CHUNK)})"
+_SQL_DELETE_OBS_CHUNK = f"DELETE FROM observations WHERE id IN ({', '.join(['?'] * _DELETE_CHUNK)})"
+_SQL_SELECT_OBS_IDS_BY_THREAD = "SELECT id FROM observations WHERE thread_id = ?"
+_SQL_DELETE_OBS = "DELETE FROM observations WHERE id = ?"
+_SQL_SELECT_OBS_BY_THREAD = f"SELECT {_OBS_COLUMNS} FROM observations WHERE thread_id = ? ORDER BY observation_date ASC"
+_SQL_SELECT_OBS_BY_RESOURCE = f"SELECT {_OBS_COLUMNS} FROM observations WHERE resource_id = ? ORDER BY observation_date ASC"
+
+# One-shot rebuild of tables created before timestamps were stored as
+# integers. SQLite can't change a column's type in place (TEXT affinity would
+# keep the integers as text), so each table is copied through om_iso_to_us().
+_SQL_MIGRATE_MESSAGES = (
+    "ALTER TABLE messages RENAME TO _messages_iso",
+    _SQL_CREATE_MESSAGES,
+    f"INSERT INTO messages ({_MSG_COLUMNS}) SELECT id, thread_id, resource_id, role, content, "
+    "om_iso_to_us(timestamp), token_count, metadata FROM _messages_iso",
+    "DROP TABLE _messages_iso",
+)
+_SQL_MIGRATE_OBSERVATIONS = (
+    "ALTER TABLE observations RENAME TO _observations_iso",
+    _SQL_CREATE_OBSERVATIONS,
+    f"INSERT INTO observations ({_OBS_COLUMNS}) SELECT id, thread_id, resource_id, "
+    "om_iso_to_us(observation_date), om_iso_to_us(referenced_date), relative_date, priority, content, "
+    "source_message_ids, token_count FROM _observations_iso",
+    "DROP TABLE _observations_iso",
+)
+
+def _id_chunks(ids: list[str]) -> list[tuple]:
+    chunks = []
+    for i in range(0, len(ids), _DELETE_CHUNK):
+        chunk = list(ids[i:i + _DELETE_CHUNK])
+        chunk.extend([chunk[-1]] * (_DELETE_CHUNK - len(chunk)))
+        chunks.append(tuple(chunk))
+    return chunks
+
+def _timestamp_migrations(msg_cols: dict, obs_cols: dict) -> list[str]:
+    """Statements needed to move tables with TEXT timestamps to INTEGER."""
+    stmts = []
+    if msg_cols.get("timestamp", "").upper() == "TEXT":
+        stmts.extend(_SQL_MIGRATE_MESSAGES)
+    if obs_cols.get("observation_date", "").upper() == "TEXT":
+        stmts.extend(_SQL_MIGRATE_OBSERVATIONS)
+    return stmts
+
 class SQLiteStorage(StorageBackend):
     """
     SQLite storage using aiosqlite for async, sqlite3 for sync.
     Default backend. Supports resource-scoped observations.
+    
+    Async writes share one connection; once a loop has done a few reads,
+    async reads are spread round-robin over `read_connections` extra
+    connections, which WAL lets run alongside the writer on their own
+    aiosqlite threads.
     """
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, read_connections: int = 2):
         if not db_path:
             db_path = os.environ.get("OM_DATABASE_URL")
         
@@ -25,135 +202,284 @@ class SQLiteStorage(StorageBackend):
             db_path = str(om_dir / "om_memory.db")
             
         self.db_path = db_path
+        # WAL needs a real file; in-memory databases keep their default journal
+        self._on_disk = db_path != ":memory:" and "mode=memory" not in db_path
+        # Separate in-memory connections would each see their own empty database
+        self.read_connections = read_connections if self._on_disk else 0
+        
+        # Long-lived connections, opened on first use. The sync connection is
+        # shared across threads (the sync wrappers run on a thread pool), so it
+        # is guarded by a lock. aiosqlite connections and asyncio locks are kept
+        # per event loop, since the sync wrappers run each call on a new loop.
+        self._conn: sqlite3.Connection = None
+        self._conn_lock = threading.RLock()
+        self._adbs: dict[asyncio.AbstractEventLoop, tuple] = {}
+        self._areaders: dict[asyncio.AbstractEventLoop, list] = {}
+        self._aread_counts: dict[asyncio.AbstractEventLoop, int] = {}
+        self._next_reader = itertools.count()
+        # id(connection) -> total_changes at its last PRAGMA optimize
+        self._optimized_at: dict[int, int] = {}
+        
+    # --- Connections ---
+    
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False,
+            isolation_level=_ISOLATION_LEVEL, cached_statements=_CACHED_STATEMENTS,
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def _connect(self):
+        """Yield the shared sync connection; commits on success, rolls back on error."""
+        with self._conn_lock:
+            if self._conn is None:
+                self._conn = self._open()
+            with self._conn:
+                yield self._conn
+            if self._needs_optimize(self._conn):
+                self._conn.execute("PRAGMA optimize")
+    
+    def _needs_optimize(self, conn) -> bool:
+        changes = conn.total_changes
+        if changes - self._optimized_at.get(id(conn), 0) < _OPTIMIZE_EVERY:
+            return False
+        self._optimized_at[id(conn)] = changes
+        return True
+        
+    async def _aopen(self) -> aiosqlite.Connection:
+        db = aiosqlite.connect(
+            self.db_path, isolation_level=_ISOLATION_LEVEL, cached_statements=_CACHED_STATEMENTS,
+        )
+        # aiosqlite's worker thread is non-daemon; an unclosed storage must not
+        # keep the interpreter alive at exit.
+        getattr(db, "_thread", db).daemon = True
+        await db
+        for pragma in _CONNECTION_PRAGMAS:
+            await db.execute(pragma)
+        return db
+        
+    async def _drop_closed_loops(self) -> None:
+        # Each sync-wrapper call runs on a throwaway loop; close the
+        # connections whose loop has finished. aiosqlite's close() can be
+        # awaited from any loop, unlike stop(), whose completion callback
+        # would target the dead loop.
+        for loop in [l for l in self._adbs if l.is_closed()]:
+            db, _ = self._adbs.pop(loop)
+            self._optimized_at.pop(id(db), None)
+            await db.close()
+        for loop in [l for l in self._areaders if l.is_closed()]:
+            for reader in self._areaders.pop(loop):
+                await reader.close()
+        for loop in [l for l in self._aread_counts if l.is_closed()]:
+            del self._aread_counts[loop]
+        
+    @asynccontextmanager
+    async def _aconnect(self):
+        """Yield this loop's connection, one caller at a time; rolls back on error."""
+        loop = asyncio.get_running_loop()
+        entry = self._adbs.get(loop)
+        if entry is None:
+            await self._drop_closed_loops()
+            entry = (await self._aopen(), asyncio.Lock())
+            self._adbs[loop] = entry
+        db, lock = entry
+        async with lock:
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            if self._needs_optimize(db):
+                await db.execute("PRAGMA optimize")
+    
+    @asynccontextmanager
+    async def _aread(self):
+        """Yield a reader connection for this loop, or the writer until the pool is worth opening."""
+        loop = asyncio.get_running_loop()
+        readers = self._areaders.get(loop)
+        if readers is None:
+            reads = self._aread_counts.get(loop, 0) + 1
+            self._aread_counts[loop] = reads
+            if not self.read_connections or reads < _READER_POOL_AFTER:
+                async with self._aconnect() as db:
+                    yield db
+                return
+            # Opened under the writer lock so the schema exists and only one
+            # coroutine creates the pool.
+            async with self._aconnect():
+                readers = self._areaders.get(loop)
+                if readers is None:
+                    readers = [await self._aopen() for _ in range(self.read_connections)]
+                    self._areaders[loop] = readers
+        # Reads are single autocommit SELECTs, so readers need no lock
+        yield readers[next(self._next_reader) % len(readers)]
         
     # --- Lifecycle ---
         
     def initialize(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # WAL lets readers proceed while a write is in progress
+            if self._on_disk:
+                conn.execute("PRAGMA journal_mode=WAL")
             self._create_tables(conn)
             
     async def ainitialize(self) -> None:
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._aconnect() as db:
+            if self._on_disk:
+                await db.execute("PRAGMA journal_mode=WAL")
             await self._acreate_tables(db)
             
     def close(self) -> None:
-        pass
+        # The sync wrappers in core open aiosqlite connections on throwaway
+        # loops; close those too. aiosqlite's close() can run on any loop.
+        if self._adbs or self._areaders:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(self._aclose_connections())
+            else:
+                # Can't block this thread's loop on a nested run; use a helper thread
+                closer = threading.Thread(target=asyncio.run, args=(self._aclose_connections(),))
+                closer.start()
+                closer.join()
+        with self._conn_lock:
+            if self._conn is not None:
+                self._optimized_at.pop(id(self._conn), None)
+                with suppress(sqlite3.Error):
+                    self._conn.execute("PRAGMA optimize")
+                self._conn.close()
+                self._conn = None
         
     async def aclose(self) -> None:
-        pass
+        await self._aclose_connections()
+        self.close()
+
+    async def _aclose_connections(self) -> None:
+        readers, self._areaders = self._areaders, {}
+        adbs, self._adbs = self._adbs, {}
+        self._aread_counts.clear()
+        for dbs in readers.values():
+            for reader in dbs:
+                await reader.close()
+        for db, _ in adbs.values():
+            self._optimized_at.pop(id(db), None)
+            with suppress(sqlite3.Error, ValueError):
+                await db.execute("PRAGMA optimize")
+            # close() is awaitable from any loop, including for connections
+            # opened on an earlier, finished one
+            await db.close()
         
     def _create_tables(self, conn: sqlite3.Connection):
         cur = conn.cursor()
-        cur.execute('''
-        CREATE TABLE IF NOT EXISTS messages (
-            id TEXT PRIMARY KEY,
-            thread_id TEXT,
-            resource_id TEXT,
-            role TEXT,
-            content TEXT,
-            timestamp TEXT,
-            token_count INTEGER,
-            metadata TEXT
-        )
-        ''')
-        cur.execute('''
-        CREATE TABLE IF NOT EXISTS observations (
-            id TEXT PRIMARY KEY,
-            thread_id TEXT,
-            resource_id TEXT,
-            observation_date TEXT,
-            referenced_date TEXT,
-            relative_date TEXT,
-            priority TEXT,
-            content TEXT,
-            source_message_ids TEXT,
-            token_count INTEGER
-        )
-        ''')
+        cur.execute(_SQL_CREATE_MESSAGES)
+        cur.execute(_SQL_CREATE_OBSERVATIONS)
         
         # Migration: add resource_id column if missing (upgrade from v0.1.x)
         # Must run BEFORE creating indexes on resource_id
-        existing_msg_cols = {row[1] for row in cur.execute("PRAGMA table_info(messages)").fetchall()}
+        existing_msg_cols = {row[1]: row[2] for row in cur.execute("PRAGMA table_info(messages)").fetchall()}
         if "resource_id" not in existing_msg_cols:
             cur.execute("ALTER TABLE messages ADD COLUMN resource_id TEXT")
-        existing_obs_cols = {row[1] for row in cur.execute("PRAGMA table_info(observations)").fetchall()}
+        existing_obs_cols = {row[1]: row[2] for row in cur.execute("PRAGMA table_info(observations)").fetchall()}
         if "resource_id" not in existing_obs_cols:
             cur.execute("ALTER TABLE observations ADD COLUMN resource_id TEXT")
         
+        # Migration: ISO text timestamps -> INTEGER epoch microseconds
+        migrations = _timestamp_migrations(existing_msg_cols, existing_obs_cols)
+        if migrations:
+            conn.create_function("om_iso_to_us", 1, _iso_to_us, deterministic=True)
+            cur.execute("BEGIN IMMEDIATE")
+            for stmt in migrations:
+                cur.execute(stmt)
+        
         # Create indexes (after migration ensures columns exist)
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(thread_id, timestamp)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_observations_thread ON observations(thread_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_observations_resource ON observations(resource_id)")
+        for stmt in _SQL_CREATE_INDEXES:
+            cur.execute(stmt)
         conn.commit()
 
     async def _acreate_tables(self, db: aiosqlite.Connection):
-        await db.execute('''
-        CREATE TABLE IF NOT EXISTS messages (
-            id TEXT PRIMARY KEY,
-            thread_id TEXT,
-            resource_id TEXT,
-            role TEXT,
-            content TEXT,
-            timestamp TEXT,
-            token_count INTEGER,
-            metadata TEXT
-        )
-        ''')
-        await db.execute('''
-        CREATE TABLE IF NOT EXISTS observations (
-            id TEXT PRIMARY KEY,
-            thread_id TEXT,
-            resource_id TEXT,
-            observation_date TEXT,
-            referenced_date TEXT,
-            relative_date TEXT,
-            priority TEXT,
-            content TEXT,
-            source_message_ids TEXT,
-            token_count INTEGER
-        )
-        ''')
+        await db.execute(_SQL_CREATE_MESSAGES)
+        await db.execute(_SQL_CREATE_OBSERVATIONS)
         
         # Migration: add resource_id column if missing (upgrade from v0.1.x)
         # Must run BEFORE creating indexes on resource_id
         async with db.execute("PRAGMA table_info(messages)") as cursor:
-            msg_cols = {row[1] for row in await cursor.fetchall()}
+            msg_cols = {row[1]: row[2] for row in await cursor.fetchall()}
         if "resource_id" not in msg_cols:
             await db.execute("ALTER TABLE messages ADD COLUMN resource_id TEXT")
         async with db.execute("PRAGMA table_info(observations)") as cursor:
-            obs_cols = {row[1] for row in await cursor.fetchall()}
+            obs_cols = {row[1]: row[2] for row in await cursor.fetchall()}
         if "resource_id" not in obs_cols:
             await db.execute("ALTER TABLE observations ADD COLUMN resource_id TEXT")
         
+        # Migration: ISO text timestamps -> INTEGER epoch microseconds
+        migrations = _timestamp_migrations(msg_cols, obs_cols)
+        if migrations:
+            await db.create_function("om_iso_to_us", 1, _iso_to_us, deterministic=True)
+            await db.execute("BEGIN IMMEDIATE")
+            for stmt in migrations:
+                await db.execute(stmt)
+        
         # Create indexes (after migration ensures columns exist)
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(thread_id, timestamp)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_observations_thread ON observations(thread_id)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_observations_resource ON observations(resource_id)")
+        for stmt in _SQL_CREATE_INDEXES:
+            await db.execute(stmt)
         await db.commit()
 
     # --- Sync Methods ---
     
     def save_messages(self, messages: list[Message]) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        if not messages: return
+        with self._connect() as conn:
             cur = conn.cursor()
-            for msg in messages:
-                cur.execute(
-                    "INSERT INTO messages (id, thread_id, resource_id, role, content, timestamp, token_count, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (msg.id, msg.thread_id, msg.resource_id, msg.role, msg.content, msg.timestamp.isoformat(), msg.token_count, json.dumps(msg.metadata))
-                )
+            cur.executemany(
+                _SQL_INSERT_MSG,
+                [self._msg_to_row(msg) for msg in messages]
+            )
             conn.commit()
             
     def get_messages(self, thread_id: str, limit: int = None) -> list[Message]:
-        query = "SELECT id, thread_id, resource_id, role, content, timestamp, token_count, metadata FROM messages WHERE thread_id = ? ORDER BY timestamp ASC"
         if limit:
-            query = f"SELECT id, thread_id, resource_id, role, content, timestamp, token_count, metadata FROM ({query} LIMIT {limit}) ORDER BY timestamp ASC"
-            
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(query, (thread_id,))
-            rows = cur.fetchall()
+            query, params = _SQL_SELECT_LATEST_MSGS, (thread_id, limit)
+        else:
+            query, params = _SQL_SELECT_MSGS, (thread_id,)
             
-        return [self._row_to_msg(row) for row in rows]
+        with self._connect() as conn:
+            # Build models straight off the cursor instead of fetchall()
+            msgs = [self._row_to_msg(row) for row in conn.execute(query, params)]
+        if limit:
+            msgs.reverse()
+        return msgs
+
+    def iter_messages(self, thread_id: str, batch_size: int = 1000) -> Iterator[Message]:
+        """
+        Yield a thread's messages oldest-first, fetching `batch_size` rows at a time.
+        Uses its own connection so the shared one isn't held while the caller
+        iterates. In-memory databases can't be reopened, so those read from the
+        shared connection, taking its lock only for each batch fetch.
+        """
+        if self._on_disk:
+            conn = self._open()
+            lock = nullcontext()
+        else:
+            conn = None
+            lock = self._conn_lock
+        try:
+            with lock:
+                if conn is None and self._conn is None:
+                    self._conn = self._open()
+                cur = (conn or self._conn).execute(_SQL_SELECT_MSGS, (thread_id,))
+            while True:
+                with lock:
+                    rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_msg(row)
+        finally:
+            if conn is not None:
+                conn.close()
 
     def _row_to_msg(self, row) -> Message:
         return Message(
@@ -162,212 +488,177 @@ class SQLiteStorage(StorageBackend):
             resource_id=row[2],
             role=row[3],
             content=row[4],
-            timestamp=datetime.fromisoformat(row[5]),
+            timestamp=_from_us(row[5]),
             token_count=row[6],
-            metadata=json.loads(row[7]) if row[7] else {},
+            metadata=_loads(row[7]) if row[7] else {},
         )
 
+    def _msg_to_row(self, msg: Message) -> tuple:
+        return (msg.id, msg.thread_id, msg.resource_id, msg.role, msg.content, _to_us(msg.timestamp), msg.token_count, _dumps(msg.metadata) if msg.metadata else None)
+
     def delete_messages(self, message_ids: list[str]) -> None:
         if not message_ids: return
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cur = conn.cursor()
-            q = f"DELETE FROM messages WHERE id IN ({','.join(['?']*len(message_ids))})"
-            cur.execute(q, message_ids)
+            cur.executemany(_SQL_DELETE_MSGS_CHUNK, _id_chunks(message_ids))
             conn.commit()
 
     def save_observations(self, observations: list[Observation]) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        if not observations: return
+        with self._connect() as conn:
             cur = conn.cursor()
-            for obs in observations:
-                cur.execute(
-                    """INSERT OR REPLACE INTO observations 
-                    (id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (obs.id, obs.thread_id, obs.resource_id, obs.observation_date.isoformat(), 
-                     obs.referenced_date.isoformat() if obs.referenced_date else None, 
-                     obs.relative_date, obs.priority.value, obs.content, 
-                     json.dumps(obs.source_message_ids), obs.token_count)
-                )
+            cur.executemany(
+                _SQL_INSERT_OBS,
+                [self._obs_to_row(obs) for obs in observations]
+            )
             conn.commit()
 
     def get_observations(self, thread_id: str) -> list[Observation]:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count "
-                "FROM observations WHERE thread_id = ? ORDER BY observation_date ASC",
-                (thread_id,)
-            )
-            rows = cur.fetchall()
-            
-        return [self._row_to_obs(row) for row in rows]
+        with self._connect() as conn:
+            return [self._row_to_obs(row) for row in conn.execute(_SQL_SELECT_OBS_BY_THREAD, (thread_id,))]
         
     def _row_to_obs(self, row) -> Observation:
         return Observation(
             id=row[0],
             thread_id=row[1],
             resource_id=row[2],
-            observation_date=datetime.fromisoformat(row[3]),
-            referenced_date=datetime.fromisoformat(row[4]) if row[4] else None,
+            observation_date=_from_us(row[3]),
+            referenced_date=_from_us(row[4]) if row[4] is not None else None,
             relative_date=row[5],
             priority=Priority(row[6]),
             content=row[7],
-            source_message_ids=json.loads(row[8]),
+            source_message_ids=_loads(row[8]),
             token_count=row[9]
         )
 
+    def _obs_to_row(self, obs: Observation) -> tuple:
+        return (obs.id, obs.thread_id, obs.resource_id, _to_us(obs.observation_date), 
+                _to_us(obs.referenced_date) if obs.referenced_date else None, 
+                obs.relative_date, obs.priority.value, obs.content, 
+                _dumps(obs.source_message_ids), obs.token_count)
+
+    def _obs_to_update_row(self, obs: Observation) -> tuple:
+        return (_to_us(obs.observation_date), 
+                _to_us(obs.referenced_date) if obs.referenced_date else None, 
+                obs.relative_date, obs.priority.value, obs.content, 
+                _dumps(obs.source_message_ids), obs.token_count, obs.resource_id, obs.id)
+
     def update_observations(self, observations: list[Observation]) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        if not observations: return
+        with self._connect() as conn:
             cur = conn.cursor()
-            for obs in observations:
-                cur.execute(
-                    """UPDATE observations 
-                    SET observation_date=?, referenced_date=?, relative_date=?, priority=?, content=?, source_message_ids=?, token_count=?, resource_id=?
-                    WHERE id=?""",
-                    (obs.observation_date.isoformat(), 
-                     obs.referenced_date.isoformat() if obs.referenced_date else None, 
-                     obs.relative_date, obs.priority.value, obs.content, 
-                     json.dumps(obs.source_message_ids), obs.token_count, obs.resource_id, obs.id)
-                )
+            cur.executemany(
+                _SQL_UPDATE_OBS,
+                [self._obs_to_update_row(obs) for obs in observations]
+            )
             conn.commit()
 
     def delete_observations(self, observation_ids: list[str]) -> None:
         if not observation_ids: return
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cur = conn.cursor()
-            q = f"DELETE FROM observations WHERE id IN ({','.join(['?']*len(observation_ids))})"
-            cur.execute(q, observation_ids)
+            cur.executemany(_SQL_DELETE_OBS_CHUNK, _id_chunks(observation_ids))
             conn.commit()
             
     def replace_observations(self, thread_id: str, observations: list[Observation]) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cur = conn.cursor()
-            cur.execute("DELETE FROM observations WHERE thread_id = ?", (thread_id,))
-            for obs in observations:
-                cur.execute(
-                    """INSERT OR REPLACE INTO observations 
-                    (id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (obs.id, obs.thread_id, obs.resource_id, obs.observation_date.isoformat(), 
-                     obs.referenced_date.isoformat() if obs.referenced_date else None, 
-                     obs.relative_date, obs.priority.value, obs.content, 
-                     json.dumps(obs.source_message_ids), obs.token_count)
-                )
+            cur.execute("BEGIN IMMEDIATE")
+            # Only delete rows that are gone; the upsert leaves unchanged rows alone
+            stale = {row[0] for row in cur.execute(_SQL_SELECT_OBS_IDS_BY_THREAD, (thread_id,))}
+            stale.difference_update(obs.id for obs in observations)
+            cur.executemany(_SQL_DELETE_OBS, [(obs_id,) for obs_id in stale])
+            cur.executemany(
+                _SQL_INSERT_OBS,
+                [self._obs_to_row(obs) for obs in observations]
+            )
             conn.commit()
 
     # Resource-scoped operations
     def get_resource_observations(self, resource_id: str) -> list[Observation]:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count "
-                "FROM observations WHERE resource_id = ? ORDER BY observation_date ASC",
-                (resource_id,)
-            )
-            rows = cur.fetchall()
-        return [self._row_to_obs(row) for row in rows]
+        with self._connect() as conn:
+            return [self._row_to_obs(row) for row in conn.execute(_SQL_SELECT_OBS_BY_RESOURCE, (resource_id,))]
     
     def save_resource_observations(self, observations: list[Observation]) -> None:
         self.save_observations(observations)
 
     # --- Async Methods ---
     
+    async def _aencode(self, to_row, items: list) -> list[tuple]:
+        if len(items) >= _OFFLOAD_ROWS:
+            return await asyncio.to_thread(lambda: [to_row(item) for item in items])
+        return [to_row(item) for item in items]
+    
     async def asave_messages(self, messages: list[Message]) -> None:
-        async with aiosqlite.connect(self.db_path) as db:
-            for msg in messages:
-                await db.execute(
-                    "INSERT INTO messages (id, thread_id, resource_id, role, content, timestamp, token_count, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (msg.id, msg.thread_id, msg.resource_id, msg.role, msg.content, msg.timestamp.isoformat(), msg.token_count, json.dumps(msg.metadata))
-                )
+        if not messages: return
+        rows = await self._aencode(self._msg_to_row, messages)
+        async with self._aconnect() as db:
+            await db.executemany(_SQL_INSERT_MSG, rows)
             await db.commit()
             
     async def aget_messages(self, thread_id: str, limit: int = None) -> list[Message]:
-        query = "SELECT id, thread_id, resource_id, role, content, timestamp, token_count, metadata FROM messages WHERE thread_id = ? ORDER BY timestamp ASC"
         if limit:
-            query = f"SELECT id, thread_id, resource_id, role, content, timestamp, token_count, metadata FROM ({query} LIMIT {limit}) ORDER BY timestamp ASC"
+            query, params = _SQL_SELECT_LATEST_MSGS, (thread_id, limit)
+        else:
+            query, params = _SQL_SELECT_MSGS, (thread_id,)
             
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(query, (thread_id,)) as cursor:
+        async with self._aread() as db:
+            async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
+        if limit:
+            rows.reverse()
                 
         return [self._row_to_msg(row) for row in rows]
 
     async def adelete_messages(self, message_ids: list[str]) -> None:
         if not message_ids: return
-        async with aiosqlite.connect(self.db_path) as db:
-            q = f"DELETE FROM messages WHERE id IN ({','.join(['?']*len(message_ids))})"
-            await db.execute(q, message_ids)
+        async with self._aconnect() as db:
+            await db.executemany(_SQL_DELETE_MSGS_CHUNK, _id_chunks(message_ids))
             await db.commit()
 
     async def asave_observations(self, observations: list[Observation]) -> None:
-        async with aiosqlite.connect(self.db_path) as db:
-            for obs in observations:
-                await db.execute(
-                    """INSERT OR REPLACE INTO observations 
-                    (id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (obs.id, obs.thread_id, obs.resource_id, obs.observation_date.isoformat(), 
-                     obs.referenced_date.isoformat() if obs.referenced_date else None, 
-                     obs.relative_date, obs.priority.value, obs.content, 
-                     json.dumps(obs.source_message_ids), obs.token_count)
-                )
+        if not observations: return
+        rows = await self._aencode(self._obs_to_row, observations)
+        async with self._aconnect() as db:
+            await db.executemany(_SQL_INSERT_OBS, rows)
             await db.commit()
 
     async def aget_observations(self, thread_id: str) -> list[Observation]:
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count "
-                "FROM observations WHERE thread_id = ? ORDER BY observation_date ASC",
-                (thread_id,)
-            ) as cursor:
+        async with self._aread() as db:
+            async with db.execute(_SQL_SELECT_OBS_BY_THREAD, (thread_id,)) as cursor:
                 rows = await cursor.fetchall()
             
         return [self._row_to_obs(row) for row in rows]
 
     async def aupdate_observations(self, observations: list[Observation]) -> None:
-        async with aiosqlite.connect(self.db_path) as db:
-            for obs in observations:
-                await db.execute(
-                    """UPDATE observations 
-                    SET observation_date=?, referenced_date=?, relative_date=?, priority=?, content=?, source_message_ids=?, token_count=?, resource_id=?
-                    WHERE id=?""",
-                    (obs.observation_date.isoformat(), 
-                     obs.referenced_date.isoformat() if obs.referenced_date else None, 
-                     obs.relative_date, obs.priority.value, obs.content, 
-                     json.dumps(obs.source_message_ids), obs.token_count, obs.resource_id, obs.id)
-                )
+        if not observations: return
+        rows = await self._aencode(self._obs_to_update_row, observations)
+        async with self._aconnect() as db:
+            await db.executemany(_SQL_UPDATE_OBS, rows)
             await db.commit()
 
     async def adelete_observations(self, observation_ids: list[str]) -> None:
         if not observation_ids: return
-        async with aiosqlite.connect(self.db_path) as db:
-            q = f"DELETE FROM observations WHERE id IN ({','.join(['?']*len(observation_ids))})"
-            await db.execute(q, observation_ids)
+        async with self._aconnect() as db:
+            await db.executemany(_SQL_DELETE_OBS_CHUNK, _id_chunks(observation_ids))
             await db.commit()
             
     async def areplace_observations(self, thread_id: str, observations: list[Observation]) -> None:
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("DELETE FROM observations WHERE thread_id = ?", (thread_id,))
-            for obs in observations:
-                await db.execute(
-                    """INSERT OR REPLACE INTO observations 
-                    (id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (obs.id, obs.thread_id, obs.resource_id, obs.observation_date.isoformat(), 
-                     obs.referenced_date.isoformat() if obs.referenced_date else None, 
-                     obs.relative_date, obs.priority.value, obs.content, 
-                     json.dumps(obs.source_message_ids), obs.token_count)
-                )
+        rows = await self._aencode(self._obs_to_row, observations)
+        async with self._aconnect() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            # Only delete rows that are gone; the upsert leaves unchanged rows alone
+            async with db.execute(_SQL_SELECT_OBS_IDS_BY_THREAD, (thread_id,)) as cursor:
+                stale = {row[0] for row in await cursor.fetchall()}
+            stale.difference_update(obs.id for obs in observations)
+            await db.executemany(_SQL_DELETE_OBS, [(obs_id,) for obs_id in stale])
+            await db.executemany(_SQL_INSERT_OBS, rows)
             await db.commit()
 
     # Resource-scoped async operations
     async def aget_resource_observations(self, resource_id: str) -> list[Observation]:
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT id, thread_id, resource_id, observation_date, referenced_date, relative_date, priority, content, source_message_ids, token_count "
-                "FROM observations WHERE resource_id = ? ORDER BY observation_date ASC",
-                (resource_id,),
-            ) as cursor:
+        async with self._aread() as db:
+            async with db.execute(_SQL_SELECT_OBS_BY_RESOURCE, (resource_id,)) as cursor:
                 rows = await cursor.fetchall()
         return [self._row_to_obs(row) for row in rows]
 
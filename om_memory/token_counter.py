@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional, Callable
 
 from om_memory.models import Message, Observation
@@ -8,12 +9,24 @@ try:
 except ImportError:
     HAS_TIKTOKEN = False
 
+# encode_ordinary_batch spins up a thread pool per call; below this many texts
+# a plain loop over encode_ordinary() is faster.
+_BATCH_THRESHOLD = 16
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """Shared tiktoken Encoding per model; encodings are immutable and thread-safe."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
 class TokenCounter:
     """
     Counts tokens for messages and observations.
     
     Uses tiktoken for OpenAI models (fast, accurate).
-    Falls back to word-based approximation (1 token ≈ 0.75 words) if tiktoken unavailable.
+    Falls back to a length-based approximation (1 token ≈ 4 chars) if tiktoken unavailable.
     Supports custom tokenizers via callback.
     """
     
@@ -22,10 +35,7 @@ class TokenCounter:
         self.custom_tokenizer = custom_tokenizer
         
         if HAS_TIKTOKEN and not custom_tokenizer:
-            try:
-                self.encoding = tiktoken.encoding_for_model(model)
-            except KeyError:
-                self.encoding = tiktoken.get_encoding("cl100k_base")
+            self.encoding = _get_encoding(model)
         else:
             self.encoding = None
             
@@ -37,32 +47,32 @@ class TokenCounter:
             return self.custom_tokenizer(text)
             
         if self.encoding:
-            return len(self.encoding.encode(text))
+            # encode_ordinary skips the special-token scan (and doesn't raise
+            # on literal "<|endoftext|>" in user text).
+            return len(self.encoding.encode_ordinary(text))
             
-        # Fallback approximation: 1 token ≈ 0.75 words
-        words = len(text.split())
-        return int(words / 0.75)
+        # Fallback approximation: 1 token ≈ 4 chars, rounded up. Within ~10%
+        # of cl100k for English prose; under-counts CJK and dense code.
+        return (len(text) + 3) // 4
+        
+    def count_many(self, texts: list[str]) -> list[int]:
+        """Count several texts; large batches go through tiktoken's threaded encode_ordinary_batch."""
+        if self.encoding and not self.custom_tokenizer and len(texts) >= _BATCH_THRESHOLD:
+            return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts)]
+        return [self.count(text) for text in texts]
         
     def count_messages(self, messages: list[Message]) -> int:
-        total = 0
-        for msg in messages:
-            if msg.token_count is not None:
-                total += msg.token_count
-            else:
-                formatted = f"{msg.role}: {msg.content}"
-                count = self.count(formatted)
+        pending = [msg for msg in messages if msg.token_count is None]
+        if pending:
+            counts = self.count_many([f"{msg.role}: {msg.content}" for msg in pending])
+            for msg, count in zip(pending, counts):
                 msg.token_count = count
-                total += count
-        return total
+        return sum(msg.token_count for msg in messages)
         
     def count_observations(self, observations: list[Observation]) -> int:
-        total = 0
-        for obs in observations:
-            if obs.token_count is not None:
-                total += obs.token_count
-            else:
-                formatted = f"{obs.priority.value} {obs.content}"
-                count = self.count(formatted)
+        pending = [obs for obs in observations if obs.token_count is None]
+        if pending:
+            counts = self.count_many([f"{obs.priority.value} {obs.content}" for obs in pending])
+            for obs, count in zip(pending, counts):
                 obs.token_count = count
-                total += count
-        return total
+        return sum(obs.token_count for obs in observations)
@@ -17,13 +17,23 @@ PTO: 20 days/yr (1.67/mo). 5+yr tenure: 25 days. Carry-over max 5 days. Q4 max 3
 REMOTE: Tue/Thu remote. L5+ 3 days/wk with manager ok. Core 10AM-4PM EST. VPN required. $1500/yr stipend.
 EXPENSES: Meals $50/day domestic, $75 international. Hotels $200/night domestic, $300 international. Receipts >$25. Economy dom; business >6hr intl. Mileage $0.67/mi."""
 
+def build_messages(kb, dynamic, query):
+    """
+    Static instructions + KB first, byte-identical on every call, so the
+    provider's prompt cache can reuse that prefix. Per-turn context follows.
+    """
+    return [
+        {"role": "system", "content": f"You are an HR assistant. Answer concisely.\nKB: {kb}"},
+        {"role": "system", "content": dynamic},
+        {"role": "user", "content": query},
+    ]
+
 async def chat_rag(oai, history, query, kb):
     """Traditional RAG: full history in every call."""
     history_text = "\n".join([f"{m['role']}: {m['content']}" for m in history])
-    sys_p = f"You are an HR assistant. Answer concisely.\nKB: {kb}\nHistory:\n{history_text}"
     resp = await oai.chat.completions.create(
         model="gpt-4o-mini",
-        messages=[{"role": "system", "content": sys_p}, {"role": "user", "content": query}],
+        messages=build_messages(kb, f"History:\n{history_text}", query),
         max_tokens=100,
     )
     answer = resp.choices[0].message.content
@@ -33,10 +43,9 @@ async def chat_rag(oai, history, query, kb):
 async def chat_om(oai, om, thread_id, query, kb):
     """OM-memory: compressed observations + rolling window."""
     memory_ctx = await om.aget_context(thread_id)
-    sys_p = f"You are an HR assistant. Answer concisely.\nKB: {kb}\n{memory_ctx}"
     resp = await oai.chat.completions.create(
         model="gpt-4o-mini",
-        messages=[{"role": "system", "content": sys_p}, {"role": "user", "content": query}],
+        messages=build_messages(kb, memory_ctx, query),
         max_tokens=100,
     )
     answer = resp.choices[0].message.content
@@ -146,22 +155,26 @@ async def test_cost_comparison(oai, om, thread_id_om):
         "Summarize my complete travel plan.",
     ]
     
-    # Traditional RAG
-    rag_history = []
-    rag_total = 0
-    rag_turns = []
-    for q in queries:
-        _, pt, ct = await chat_rag(oai, rag_history, q, KB)
-        rag_total += pt + ct
-        rag_turns.append(pt)
+    async def run_rag():
+        # Traditional RAG
+        history, total, turns = [], 0, []
+        for q in queries:
+            _, pt, ct = await chat_rag(oai, history, q, KB)
+            total += pt + ct
+            turns.append(pt)
+        return total, turns
+    
+    async def run_om():
+        # OM Memory (use a separate thread)
+        total, turns = 0, []
+        for q in queries:
+            _, pt, ct = await chat_om(oai, om, thread_id_om, q, KB)
+            total += pt + ct
+            turns.append(pt)
+        return total, turns
     
-    # OM Memory (use a separate thread)
-    om_total = 0
-    om_turns = []
-    for q in queries:
-        _, pt, ct = await chat_om(oai, om, thread_id_om, q, KB)
-        om_total += pt + ct
-        om_turns.append(pt)
+    # Turns within a track depend on each other; the two tracks don't.
+    (rag_total, rag_turns), (om_total, om_turns) = await asyncio.gather(run_rag(), run_om())
     
     stats = await om.aget_stats(thread_id_om)
     bg_tokens = stats.total_input_tokens + stats.total_output_tokens
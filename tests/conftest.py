@@ -0,0 +1,55 @@
+import uuid
+
+import pytest
+
+from om_memory.providers.base import LLMProvider
+from om_memory.token_counter import TokenCounter
+
+
+class MockProvider(LLMProvider):
+    """Returns a canned observer/reflector response for every prompt."""
+
+    _DEFAULT = "Date: 2026-03-01\n- 🔴 12:00 Mock observation\n"
+
+    def __init__(self, response: str = None):
+        self.response = response or self._DEFAULT
+
+    @property
+    def model_name(self):
+        return "mock"
+
+    async def acomplete(self, sys, usr):
+        return self.response
+
+    def complete(self, sys, usr):
+        return self.response
+
+
+@pytest.fixture(scope="session")
+def mock_provider_cls():
+    """The MockProvider class, for tests that need their own response or a subclass."""
+    return MockProvider
+
+
+@pytest.fixture(scope="session")
+def mock_provider():
+    """Stateless, so one instance serves every test."""
+    return MockProvider()
+
+
+@pytest.fixture(scope="module")
+def sqlite_dir(tmp_path_factory):
+    """One directory per test module for file-backed SQLite tests."""
+    return tmp_path_factory.mktemp("sqlite")
+
+
+@pytest.fixture
+def sqlite_db_path(sqlite_dir):
+    """A database path in the module's sqlite_dir that no other test uses."""
+    return sqlite_dir / f"{uuid.uuid4().hex}.db"
+
+
+@pytest.fixture(scope="session")
+def token_counter():
+    """One counter for the run; tests never mutate it."""
+    return TokenCounter()
@@ -1,12 +1,9 @@
 import pytest
-from datetime import datetime, timezone
 from om_memory.context_builder import ContextBuilder
 from om_memory.models import Observation, Message, Priority
-from om_memory.token_counter import TokenCounter
 
-def test_context_builder_text():
-    counter = TokenCounter()
-    builder = ContextBuilder(counter)
+def test_context_builder_text(token_counter):
+    builder = ContextBuilder(token_counter)
     
     observations = [
         Observation(thread_id="1", priority=Priority.CRITICAL, content="CURRENT TASK: Testing Context")
@@ -21,9 +18,8 @@ def test_context_builder_text():
     assert "CURRENT TASK: Testing Context" in ctx
     assert "user: Hi" in ctx
 
-def test_context_builder_dict():
-    counter = TokenCounter()
-    builder = ContextBuilder(counter)
+def test_context_builder_dict(token_counter):
+    builder = ContextBuilder(token_counter)
     
     observations = [
         Observation(thread_id="1", priority=Priority.CRITICAL, content="CURRENT TASK: Testing Context")
@@ -3,26 +3,18 @@ import asyncio
 from om_memory.core import ObservationalMemory
 from om_memory.storage.memory import InMemoryStorage
 from om_memory.models import OMConfig
-from om_memory.providers.base import LLMProvider
-
-class MockProvider(LLMProvider):
-    @property
-    def model_name(self): return "mock"
-    async def acomplete(self, sys, usr):
-        return "Date: 2026-03-01\n- 🔴 12:00 Mock observation\n"
-    def complete(self, sys, usr):
-        return "Date: 2026-03-01\n- 🔴 12:00 Mock observation\n"
 
 @pytest.fixture
-def memory_om():
+async def memory_om(mock_provider):
     config = OMConfig(
         observer_token_threshold=10, # Very low to trigger it easily
         auto_observe=True,
         message_retention_count=0,  # Delete all messages after observation (legacy behavior)
     )
-    provider = MockProvider()
     storage = InMemoryStorage()
-    return ObservationalMemory(provider=provider, storage=storage, config=config)
+    om = ObservationalMemory(provider=mock_provider, storage=storage, config=config)
+    yield om
+    await om.aclose()
 
 @pytest.mark.asyncio
 async def test_om_add_message_triggers_observer(memory_om):
@@ -3,24 +3,9 @@ from unittest.mock import AsyncMock
 
 from om_memory.observer import Observer
 from om_memory.models import Message, OMConfig
-from om_memory.providers.base import LLMProvider
-from om_memory.token_counter import TokenCounter
-
-class MockProvider(LLMProvider):
-    def __init__(self, response: str):
-        self.response = response
-        
-    @property
-    def model_name(self): return "mock"
-    
-    async def acomplete(self, sys, usr):
-        return self.response
-        
-    def complete(self, sys, usr):
-        return self.response
 
 @pytest.mark.asyncio
-async def test_observer_parsing():
+async def test_observer_parsing(token_counter, mock_provider_cls):
     mock_llm_response = """
 Date: 2026-03-01
 - 🔴 10:00 Decided on SQLite (referenced: 2026-03-01, meaning "today")
@@ -28,11 +13,10 @@ Date: 2026-03-01
 CURRENT_TASK: Setting up DB
 SUGGESTED_NEXT: Write tests
 """
-    provider = MockProvider(mock_llm_response)
+    provider = mock_provider_cls(mock_llm_response)
     config = OMConfig()
-    counter = TokenCounter()
     
-    observer = Observer(provider, config, counter)
+    observer = Observer(provider, config, token_counter)
     
     msg = Message(thread_id="1", role="user", content="Let's use sqlite and dark mode.")
     obs = await observer.aobserve("1", [msg])
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from om_memory.core import ObservationalMemory
+from om_memory.models import OMConfig, Observation, Priority
+from om_memory.providers import _http
+from om_memory.providers.base import LLMProvider
+from om_memory.providers.caching import CachingLLMProvider
+from om_memory.providers.concurrency import get_semaphore
+from om_memory.providers.fallback import FallbackLLMProvider, AllProvidersFailedError
+from om_memory.providers.ollama_provider import OllamaProvider
+from om_memory.providers.router import RouterProvider
+from om_memory.reflector import Reflector
+from om_memory.storage.memory import InMemoryStorage
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self, response: str = "ok", delay: float = 0.0):
+        self.response = response
+        self.delay = delay
+        self.calls = 0
+
+    @property
+    def model_name(self):
+        return "mock"
+
+    async def acomplete(self, sys, usr):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return f"{self.response}:{usr}"
+
+    def complete(self, sys, usr):
+        self.calls += 1
+        return f"{self.response}:{usr}"
+
+
+class TestCachingProvider:
+    def test_sync_hit_skips_delegate(self):
+        inner = CountingProvider()
+        provider = CachingLLMProvider(inner)
+        assert provider.complete("s", "u") == "ok:u"
+        assert provider.complete("s", "u") == "ok:u"
+        assert provider.complete("s", "other") == "ok:other"
+        assert inner.calls == 2
+        assert provider.hits == 1
+
+    def test_lru_eviction_and_ttl(self):
+        inner = CountingProvider()
+        provider = CachingLLMProvider(inner, maxsize=1)
+        provider.complete("s", "a")
+        provider.complete("s", "b")
+        provider.complete("s", "a")
+        assert inner.calls == 3
+
+        expiring = CachingLLMProvider(inner, ttl=-1)
+        expiring.complete("s", "a")
+        expiring.complete("s", "a")
+        assert inner.calls == 5
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_coalesce(self):
+        inner = CountingProvider(delay=0.01)
+        provider = CachingLLMProvider(inner)
+        results = await asyncio.gather(*(provider.acomplete("s", "u") for _ in range(5)))
+        assert results == ["ok:u"] * 5
+        assert inner.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_follower_retries_when_leader_cancelled(self):
+        inner = CountingProvider(delay=0.01)
+        provider = CachingLLMProvider(inner)
+        leader = asyncio.create_task(provider.acomplete("s", "u"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(provider.acomplete("s", "u"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == "ok:u"
+        assert inner.calls == 2
+
+    def test_config_enables_wrapper(self):
+        om = ObservationalMemory(
+            provider=CountingProvider(),
+            storage=InMemoryStorage(),
+            config=OMConfig(enable_cache=True),
+        )
+        assert isinstance(om.provider, CachingLLMProvider)
+        assert om.provider.model_name == "mock"
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FailingProvider(CountingProvider):
+    def __init__(self, exc: Exception):
+        super().__init__()
+        self.exc = exc
+
+    async def acomplete(self, sys, usr):
+        self.calls += 1
+        raise self.exc
+
+    def complete(self, sys, usr):
+        self.calls += 1
+        raise self.exc
+
+
+class TestFallbackProvider:
+    @pytest.mark.asyncio
+    async def test_falls_through_on_transient_error(self):
+        primary = FailingProvider(StatusError(503))
+        backup = CountingProvider()
+        provider = FallbackLLMProvider([primary, backup])
+        assert await provider.acomplete("s", "u") == "ok:u"
+        assert primary.calls == 1 and backup.calls == 1
+
+    def test_client_error_raises_immediately(self):
+        primary = FailingProvider(StatusError(401))
+        backup = CountingProvider()
+        provider = FallbackLLMProvider([primary, backup])
+        with pytest.raises(StatusError):
+            provider.complete("s", "u")
+        assert backup.calls == 0
+
+    def test_circuit_opens_after_threshold(self):
+        primary = FailingProvider(StatusError(429))
+        backup = CountingProvider()
+        provider = FallbackLLMProvider([primary, backup], failure_threshold=2)
+        for _ in range(4):
+            provider.complete("s", "u")
+        assert primary.calls == 2
+        assert backup.calls == 4
+
+    def test_all_failed_carries_attempts(self):
+        provider = FallbackLLMProvider([FailingProvider(TimeoutError("slow")), FailingProvider(StatusError(500))])
+        with pytest.raises(AllProvidersFailedError) as exc_info:
+            provider.complete("s", "u")
+        assert len(exc_info.value.attempts) == 2
+
+
+class TestRouterProvider:
+    @pytest.mark.asyncio
+    async def test_latency_strategy_prefers_fastest(self):
+        slow = CountingProvider(response="slow", delay=0.02)
+        fast = CountingProvider(response="fast")
+        router = RouterProvider([slow, fast], strategy="latency")
+        # First two calls measure each provider once
+        await router.acomplete("s", "u")
+        await router.acomplete("s", "u")
+        assert await router.acomplete("s", "u") == "fast:u"
+        assert slow.calls == 1
+
+    def test_ordered_strategy_keeps_order(self):
+        first, second = CountingProvider(response="a"), CountingProvider(response="b")
+        router = RouterProvider([first, second], strategy="ordered")
+        assert router.complete("s", "u") == "a:u"
+        assert router.complete("s", "u") == "a:u"
+        assert second.calls == 0
+
+
+class TestBatchReflection:
+    @pytest.mark.asyncio
+    async def test_default_batch_complete_keeps_order_and_errors(self):
+        class Flaky(CountingProvider):
+            async def acomplete(self, sys, usr):
+                if usr == "bad":
+                    raise RuntimeError("boom")
+                return await super().acomplete(sys, usr)
+
+        results = await Flaky().abatch_complete([("s", "a"), ("s", "bad"), ("s", "b")], max_concurrency=2)
+        assert results[0] == "ok:a" and results[2] == "ok:b"
+        assert isinstance(results[1], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_areflect_many(self, token_counter):
+        provider = CountingProvider()
+        provider.acomplete = AsyncMock(return_value="Date: 2026-03-01\n- 🔴 12:00 Merged")
+        reflector = Reflector(provider, OMConfig(reflect_min_tokens=0), token_counter)
+        obs = Observation(thread_id="t1", content="a", priority=Priority.INFO, observation_date=datetime(2026, 3, 1))
+        results = await reflector.areflect_many([("t1", [obs]), ("t2", [])])
+        assert [o.content for o in results[0]] == ["Merged"]
+        assert results[1] == []
+        assert provider.acomplete.await_count == 1
+
+
+class TestConcurrencyLimit:
+    @pytest.mark.asyncio
+    async def test_semaphore_cached_per_loop_and_limit(self):
+        cfg = OMConfig(max_inflight_llm=2)
+        sem = get_semaphore(cfg)
+        assert get_semaphore(cfg) is sem
+        assert get_semaphore(OMConfig(max_inflight_llm=4)) is not sem
+        # A different limit doesn't replace the cached one
+        assert get_semaphore(cfg) is sem
+
+    @pytest.mark.asyncio
+    async def test_areflect_many_holds_shared_semaphore(self, token_counter):
+        class Tracking(CountingProvider):
+            inflight = peak = 0
+
+            async def acomplete(self, sys, usr):
+                Tracking.inflight += 1
+                Tracking.peak = max(Tracking.peak, Tracking.inflight)
+                await asyncio.sleep(0.01)
+                Tracking.inflight -= 1
+                return "Date: 2026-03-01\n- 🔴 12:00 Merged"
+
+        cfg = OMConfig(reflect_min_tokens=0, max_inflight_llm=1)
+        reflector = Reflector(Tracking(), cfg, token_counter)
+        batches = [(f"t{i}", [Observation(thread_id=f"t{i}", content="a", priority=Priority.INFO)]) for i in range(3)]
+        await reflector.areflect_many(batches)
+        assert Tracking.peak == 1
+
+
+class TestStreaming:
+    @pytest.mark.asyncio
+    async def test_default_astream_yields_full_completion(self):
+        chunks = [c async for c in CountingProvider().astream("s", "u")]
+        assert chunks == ["ok:u"]
+
+    @pytest.mark.asyncio
+    async def test_ollama_astream_reads_ndjson(self):
+        body = b'{"message":{"content":"Hel"},"done":false}\n{"message":{"content":"lo"},"done":false}\n{"done":true}\n'
+
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(200, content=body)
+
+        provider = OllamaProvider()
+        _http._async_clients[asyncio.get_running_loop()] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        chunks = [c async for c in provider.astream("s", "u")]
+        assert chunks == ["Hel", "lo"]
+        await _http.aclose_all()
+
+
+class TestSharedHttpClient:
+    @pytest.mark.asyncio
+    async def test_async_client_shared_and_recreated_after_close(self):
+        client = _http.get_async_client()
+        assert _http.get_async_client() is client
+        await _http.aclose_all()
+        assert client.is_closed
+        assert _http.get_async_client() is not client
+        await _http.aclose_all()
+
+    @pytest.mark.asyncio
+    async def test_provider_close_leaves_shared_clients_open(self):
+        client = _http.get_async_client()
+        await OllamaProvider().aclose()
+        assert not client.is_closed
+        await _http.aclose_all()
+
+    def test_aclose_all_reaches_clients_on_other_loops(self):
+        async def grab():
+            return _http.get_async_client()
+
+        async def grab_and_settle():
+            client = _http.get_async_client()
+            await asyncio.gather(*_http._closing)
+            return client
+
+        running, idle, main = asyncio.new_event_loop(), asyncio.new_event_loop(), asyncio.new_event_loop()
+        thread = threading.Thread(target=running.run_forever)
+        thread.start()
+        try:
+            running_client = asyncio.run_coroutine_threadsafe(grab(), running).result(timeout=5)
+            idle_client = idle.run_until_complete(grab())
+
+            main.run_until_complete(_http.aclose_all())
+            # Closed on the loop running in another thread
+            assert running_client.is_closed
+            # Retired on the idle loop, closed when that loop next asks for a client
+            assert not idle_client.is_closed
+            fresh = idle.run_until_complete(grab_and_settle())
+            assert fresh is not idle_client and idle_client.is_closed
+            idle.run_until_complete(fresh.aclose())
+        finally:
+            running.call_soon_threadsafe(running.stop)
+            thread.join()
+            for loop in (running, idle, main):
+                loop.close()
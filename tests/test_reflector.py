@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from om_memory.reflector import Reflector
+from om_memory.models import Observation, OMConfig, Priority
+from om_memory.observability.callbacks import CallbackManager, EventType
+
+def _obs(content: str) -> Observation:
+    return Observation(thread_id="1", content=content, priority=Priority.INFO, observation_date=datetime(2026, 3, 1, 10, 0))
+
+@pytest.mark.asyncio
+async def test_reflector_skips_small_logs(token_counter, mock_provider_cls):
+    provider = mock_provider_cls("Date: 2026-03-01\n- 🔴 10:00 Merged")
+    provider.acomplete = AsyncMock(return_value=provider.response)
+    callbacks = CallbackManager()
+    skipped = []
+    callbacks.on(EventType.REFLECTOR_SKIPPED, lambda e: skipped.append(e.data["reason"]))
+    
+    reflector = Reflector(provider, OMConfig(reflect_min_tokens=500), token_counter)
+    observations = [_obs("Prefers dark mode")]
+    
+    assert await reflector.areflect("1", observations, callbacks) is observations
+    assert skipped == ["below_min_tokens"]
+    provider.acomplete.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_reflector_skips_its_own_output(token_counter, mock_provider_cls):
+    provider = mock_provider_cls("Date: 2026-03-01\n- 🔴 10:00 Merged")
+    provider.acomplete = AsyncMock(return_value=provider.response)
+    callbacks = CallbackManager()
+    skipped = []
+    callbacks.on(EventType.REFLECTOR_SKIPPED, lambda e: skipped.append(e.data["reason"]))
+    
+    reflector = Reflector(provider, OMConfig(reflect_min_tokens=0), token_counter)
+    reflected = await reflector.areflect("1", [_obs("a"), _obs("b")], callbacks)
+    assert [o.content for o in reflected] == ["Merged"]
+    
+    assert await reflector.areflect("1", reflected, callbacks) is reflected
+    assert skipped == ["unchanged"]
+    assert provider.acomplete.await_count == 1
+
+@pytest.mark.asyncio
+async def test_reflector_merges_new_observations_into_prior_output(token_counter, mock_provider_cls):
+    provider = mock_provider_cls("Date: 2026-03-01\n- 🔴 10:00 Merged")
+    provider.acomplete = AsyncMock(return_value=provider.response)
+    
+    reflector = Reflector(provider, OMConfig(reflect_min_tokens=0), token_counter)
+    reflected = await reflector.areflect("1", [_obs("a"), _obs("b")])
+    
+    result = await reflector.areflect("1", reflected + [_obs("Likes tea")])
+    user_prompt = provider.acomplete.await_args.args[1]
+    summary, new = user_prompt.split("New Observations:")
+    assert "Merged" in summary and "Likes tea" in new
+    # The LLM output replaces the prior summary rather than being appended to it
+    assert [o.content for o in result] == ["Merged"]
+
+@pytest.mark.asyncio
+async def test_reflector_state_is_bounded(token_counter, monkeypatch, mock_provider_cls):
+    monkeypatch.setattr("om_memory.reflector._MAX_TRACKED_THREADS", 2)
+    provider = mock_provider_cls("Date: 2026-03-01\n- 🔴 10:00 Merged")
+    reflector = Reflector(provider, OMConfig(reflect_min_tokens=0), token_counter)
+    for thread_id in ("a", "b", "c"):
+        await reflector.areflect(thread_id, [_obs("x")])
+    assert list(reflector._last_reflected) == ["b", "c"]
+    assert list(reflector._reflected_ids) == ["b", "c"]
@@ -1,8 +1,12 @@
 import pytest
 import asyncio
+import sqlite3
+from datetime import datetime, timezone
 from om_memory.storage.memory import InMemoryStorage
 from om_memory.storage.sqlite import SQLiteStorage
-from om_memory.models import Message
+from om_memory.storage.sharded import ShardedSQLiteStorage
+from om_memory.storage.redis_store import RedisStorage
+from om_memory.models import Message, Observation, Priority
 
 @pytest.fixture
 def memory_storage():
@@ -29,10 +33,27 @@ async def test_memory_storage_delete(memory_storage):
     assert len(msgs) == 1
     assert msgs[0].content == "Hello 2"
 
+def test_memory_storage_keeps_messages_sorted(memory_storage):
+    late = Message(thread_id="t", role="user", content="late", timestamp=datetime(2026, 1, 2))
+    early = Message(thread_id="t", role="user", content="early", timestamp=datetime(2026, 1, 1))
+    memory_storage.save_messages([late, early])
+    assert [m.content for m in memory_storage.get_messages("t")] == ["early", "late"]
+    assert [m.content for m in memory_storage.get_messages("t", limit=1)] == ["late"]
+
+def test_memory_storage_resource_index_follows_writes(memory_storage):
+    a = Observation(thread_id="t1", resource_id="u", content="a", priority=Priority.INFO)
+    b = Observation(thread_id="t2", resource_id="u", content="b", priority=Priority.INFO)
+    memory_storage.save_observations([a, b])
+    assert [o.content for o in memory_storage.get_resource_observations("u")] == ["a", "b"]
+    
+    memory_storage.save_observations([a.model_copy(update={"resource_id": "v"})])
+    memory_storage.replace_observations("t2", [])
+    assert memory_storage.get_resource_observations("u") == []
+    assert [o.content for o in memory_storage.get_resource_observations("v")] == ["a"]
+
 @pytest.mark.asyncio
-async def test_sqlite_storage(tmp_path):
-    db_path = str(tmp_path / "test.db")
-    storage = SQLiteStorage(db_path=db_path)
+async def test_sqlite_storage():
+    storage = SQLiteStorage(db_path=":memory:")
     await storage.ainitialize()
     
     msg = Message(thread_id="thread_sq", role="user", content="Stored in SQL")
@@ -44,3 +65,309 @@ async def test_sqlite_storage(tmp_path):
     
     await storage.adelete_messages([msg.id])
     assert len(await storage.aget_messages("thread_sq")) == 0
+    await storage.aclose()
+
+@pytest.mark.asyncio
+async def test_observation_upsert(memory_storage):
+    sqlite_storage = SQLiteStorage(db_path=":memory:")
+    await sqlite_storage.ainitialize()
+    for storage in (memory_storage, sqlite_storage):
+        obs = Observation(thread_id="t1", content="v1", priority=Priority.INFO)
+        await storage.asave_observations([obs])
+        obs.content = "v2"
+        await storage.asave_observations([obs])
+        result = await storage.aget_observations("t1")
+        assert [o.content for o in result] == ["v2"]
+    await sqlite_storage.aclose()
+
+@pytest.mark.asyncio
+async def test_sqlite_reader_pool_opens_after_repeated_reads(sqlite_db_path):
+    from om_memory.storage.sqlite import _READER_POOL_AFTER
+
+    storage = SQLiteStorage(db_path=str(sqlite_db_path))
+    await storage.ainitialize()
+    # A short-lived loop (one sync-wrapper call) reads through the writer
+    for _ in range(_READER_POOL_AFTER - 1):
+        await storage.aget_messages("t")
+    assert not storage._areaders
+    await storage.aget_messages("t")
+    assert len(storage._areaders[asyncio.get_running_loop()]) == storage.read_connections
+    await storage.aclose()
+
+@pytest.mark.asyncio
+async def test_sqlite_limit_returns_latest(sqlite_db_path):
+    storage = SQLiteStorage(db_path=str(sqlite_db_path))
+    await storage.ainitialize()
+    msgs = [
+        Message(thread_id="t", role="user", content=str(i), timestamp=datetime(2026, 1, i + 1))
+        for i in range(5)
+    ]
+    await storage.asave_messages(msgs)
+    assert [m.content for m in await storage.aget_messages("t", limit=2)] == ["3", "4"]
+    await storage.aclose()
+    storage.initialize()
+    assert [m.content for m in storage.get_messages("t", limit=2)] == ["3", "4"]
+    assert [m.content for m in storage.iter_messages("t", batch_size=2)] == ["0", "1", "2", "3", "4"]
+    storage.close()
+
+def test_sqlite_sync_close_closes_async_connections(sqlite_db_path, mock_provider):
+    from om_memory.core import ObservationalMemory
+
+    storage = SQLiteStorage(db_path=str(sqlite_db_path))
+    om = ObservationalMemory(provider=mock_provider, storage=storage)
+    # Each sync call runs on its own event loop and opens an aiosqlite connection there
+    om.add_message("t", "user", "hi")
+    om.get_context("t")
+    assert storage._adbs
+    om.close()
+    assert not storage._adbs and not storage._areaders
+
+def test_sqlite_iter_messages_in_memory():
+    # A second connection to :memory: would open a different, empty database
+    storage = SQLiteStorage(db_path=":memory:")
+    storage.initialize()
+    storage.save_messages([
+        Message(thread_id="t", role="user", content=str(i), timestamp=datetime(2026, 1, i + 1))
+        for i in range(5)
+    ])
+    assert [m.content for m in storage.iter_messages("t", batch_size=2)] == ["0", "1", "2", "3", "4"]
+    storage.close()
+
+def test_memory_storage_deletes_by_id_index(memory_storage):
+    a = Observation(thread_id="a", content="a", priority=Priority.INFO)
+    b = Observation(thread_id="b", content="b", priority=Priority.INFO)
+    memory_storage.save_observations([a, b])
+    memory_storage.delete_observations([b.id, "missing"])
+    assert memory_storage.get_observations("a") == [a]
+    assert memory_storage.get_observations("b") == []
+
+    memory_storage.replace_observations("a", [b.model_copy(update={"thread_id": "a"})])
+    memory_storage.delete_observations([a.id])
+    assert [o.content for o in memory_storage.get_observations("a")] == ["b"]
+
+@pytest.mark.asyncio
+async def test_sqlite_rows_decode_to_equal_models():
+    storage = SQLiteStorage(db_path=":memory:")
+    await storage.ainitialize()
+    msg = Message(thread_id="t", resource_id="u", role="user", content="hi", token_count=3, metadata={"k": "v"})
+    obs = Observation(
+        thread_id="t", resource_id="u", priority=Priority.CRITICAL, content="c",
+        referenced_date=datetime(2026, 3, 5, tzinfo=timezone.utc), relative_date="next week",
+        source_message_ids=[msg.id], token_count=4,
+    )
+    # Different tables, no ordering between them
+    await asyncio.gather(storage.asave_messages([msg]), storage.asave_observations([obs]))
+    assert await storage.aget_messages("t") == [msg]
+    assert await storage.aget_observations("t") == [obs]
+    await storage.aclose()
+
+@pytest.mark.asyncio
+async def test_sqlite_large_batch_roundtrip():
+    storage = SQLiteStorage(db_path=":memory:")
+    await storage.ainitialize()
+    msgs = [Message(thread_id="t", role="user", content=str(i), metadata={"i": i}) for i in range(300)]
+    await storage.asave_messages(msgs)
+    stored = await storage.aget_messages("t")
+    assert len(stored) == 300
+    assert {m.metadata["i"] for m in stored} == set(range(300))
+    await storage.aclose()
+
+@pytest.mark.asyncio
+async def test_sqlite_replace_observations_applies_diff():
+    storage = SQLiteStorage(db_path=":memory:")
+    await storage.ainitialize()
+    keep = Observation(thread_id="t", content="keep", priority=Priority.INFO)
+    drop = Observation(thread_id="t", content="drop", priority=Priority.INFO)
+    other = Observation(thread_id="u", content="other", priority=Priority.INFO)
+    await storage.asave_observations([keep, drop, other])
+    added = Observation(thread_id="t", content="added", priority=Priority.INFO)
+    await storage.areplace_observations("t", [keep, added])
+    assert {o.content for o in await storage.aget_observations("t")} == {"keep", "added"}
+    assert [o.content for o in await storage.aget_observations("u")] == ["other"]
+    await storage.aclose()
+
+class RecordingPipeline:
+    def __init__(self):
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args))
+
+def test_redis_batches_writes_on_one_pipeline():
+    storage = RedisStorage(prefix="om")
+    pipe = RecordingPipeline()
+    msgs = [Message(thread_id="t", role="user", content=str(i)) for i in range(3)]
+    storage._queue_save_messages(pipe, msgs)
+    assert [c[0] for c in pipe.commands] == ["zadd", "hset"] * 3 + ["hset"]
+    assert pipe.commands[0][1][0] == "om:msgs:t"
+
+    pipe = RecordingPipeline()
+    storage._queue_delete_messages(pipe, [msgs[0].id, "missing"], ["t", None])
+    assert pipe.commands == [
+        ("zrem", ("om:msgs:t", msgs[0].id)),
+        ("hdel", ("om:msg:t", msgs[0].id)),
+        ("hdel", ("om:msg_thread", msgs[0].id, "missing")),
+    ]
+
+class ReplyClient:
+    """Answers each Redis read command with a canned reply and records the call."""
+
+    def __init__(self, **replies):
+        self.replies = replies
+        self.calls = []
+
+    def __getattr__(self, name):
+        def command(*args):
+            self.calls.append((name, args))
+            return self.replies[name]
+        return command
+
+def test_redis_get_messages_decodes_in_score_order():
+    msgs = [Message(thread_id="t", role="user", content=str(i), metadata={"i": i}) for i in range(3)]
+    storage = RedisStorage(prefix="om")
+    storage._client = ReplyClient(
+        zrange=[m.id for m in msgs[1:]],
+        # A hash entry deleted after the ZRANGE comes back as None
+        hmget=[msgs[1].model_dump_json(), None],
+    )
+    assert storage.get_messages("t", limit=2) == [msgs[1]]
+    assert storage._client.calls[0] == ("zrange", ("om:msgs:t", -2, -1))
+    assert storage._client.calls[1] == ("hmget", ("om:msg:t", [m.id for m in msgs[1:]]))
+
+def test_redis_get_observations_sorts_and_filters_by_resource():
+    obs = [
+        Observation(thread_id="t", resource_id=r, content=c, priority=Priority.INFO,
+                    observation_date=datetime(2026, 1, d, tzinfo=timezone.utc))
+        for r, c, d in [("u", "late", 3), (None, "other", 2), ("u", "early", 1)]
+    ]
+    storage = RedisStorage(prefix="om")
+    storage._client = ReplyClient(hvals=[o.model_dump_json() for o in obs])
+    assert storage.get_observations("t") == [obs[2], obs[1], obs[0]]
+    assert [o.content for o in storage._decode_observations([o.model_dump_json() for o in obs], "u")] == ["early", "late"]
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_redis_roundtrip(use_async):
+    fakeredis = pytest.importorskip("fakeredis")
+    storage = RedisStorage(prefix="om")
+    msgs = [Message(thread_id="t", role="user", content=str(i), timestamp=datetime(2026, 1, i + 1, tzinfo=timezone.utc)) for i in range(3)]
+    obs = [
+        Observation(thread_id=t, resource_id="u", content=t, priority=Priority.INFO,
+                    observation_date=datetime(2026, 1, d, tzinfo=timezone.utc))
+        for t, d in [("t", 1), ("t2", 2)]
+    ]
+    moved = obs[1].model_copy(update={"thread_id": "t"})
+
+    def check_sync():
+        storage._client = fakeredis.FakeRedis(decode_responses=True)
+        storage.save_messages(msgs)
+        storage.delete_messages([msgs[0].id])
+        assert storage.get_messages("t") == msgs[1:]
+        assert storage.get_messages("t", limit=1) == msgs[2:]
+        storage.save_observations(obs)
+        assert storage.get_observations("t") == obs[:1]
+        assert storage.get_resource_observations("u") == obs
+        storage.replace_observations("t", [])
+        assert storage.get_resource_observations("u") == obs[1:]
+        storage.replace_observations("t", [moved])
+        assert storage.get_observations("t2") == []
+        assert storage.get_resource_observations("u") == [moved]
+
+    async def check_async():
+        storage._aclients[asyncio.get_running_loop()] = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        await storage.asave_messages(msgs)
+        await storage.adelete_messages([msgs[0].id])
+        assert await storage.aget_messages("t") == msgs[1:]
+        assert await storage.aget_messages("t", limit=1) == msgs[2:]
+        await storage.asave_observations(obs)
+        assert await storage.aget_observations("t") == obs[:1]
+        assert await storage.aget_resource_observations("u") == obs
+        await storage.areplace_observations("t", [])
+        assert await storage.aget_resource_observations("u") == obs[1:]
+        await storage.areplace_observations("t", [moved])
+        assert await storage.aget_observations("t2") == []
+        assert await storage.aget_resource_observations("u") == [moved]
+
+    if use_async:
+        asyncio.run(check_async())
+    else:
+        check_sync()
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_sqlite_migrates_text_timestamps(sqlite_db_path, use_async):
+    db_path = str(sqlite_db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE messages (id TEXT PRIMARY KEY, thread_id TEXT, role TEXT, content TEXT, "
+        "timestamp TEXT, token_count INTEGER, metadata TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE observations (id TEXT PRIMARY KEY, thread_id TEXT, observation_date TEXT, "
+        "referenced_date TEXT, relative_date TEXT, priority TEXT, content TEXT, "
+        "source_message_ids TEXT, token_count INTEGER)"
+    )
+    conn.execute(
+        "INSERT INTO messages VALUES ('m1', 't', 'user', 'old', '2026-01-02T03:04:05.123456+00:00', 1, '{}')"
+    )
+    conn.execute(
+        "INSERT INTO observations VALUES ('o1', 't', '2026-01-02T03:04:05', NULL, NULL, '🔴', 'fact', '[]', 1)"
+    )
+    conn.commit()
+    conn.close()
+
+    storage = SQLiteStorage(db_path=db_path)
+    if use_async:
+        async def run():
+            await storage.ainitialize()
+            result = (await storage.aget_messages("t"), await storage.aget_observations("t"))
+            await storage.aclose()
+            return result
+        msgs, obs = asyncio.run(run())
+    else:
+        storage.initialize()
+        msgs, obs = storage.get_messages("t"), storage.get_observations("t")
+        storage.close()
+
+    assert msgs[0].timestamp == datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    assert obs[0].observation_date == datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT typeof(timestamp) FROM messages").fetchone() == ("integer",)
+    conn.close()
+
+@pytest.mark.asyncio
+async def test_sharded_sqlite_routes_by_thread(sqlite_db_path):
+    db_path = sqlite_db_path
+    storage = ShardedSQLiteStorage(db_path=str(db_path), shards=3)
+    await storage.ainitialize()
+    msgs = [Message(thread_id=f"t{i}", role="user", content=str(i)) for i in range(6)]
+    await storage.asave_messages(msgs)
+    assert [m.content for m in await storage.aget_messages("t4")] == ["4"]
+    assert sum(1 for s in storage.shards if s.get_messages("t4")) == 1
+
+    await storage.adelete_messages([msgs[4].id])
+    assert await storage.aget_messages("t4") == []
+
+    shared = [Observation(thread_id=f"t{i}", resource_id="u", content=str(i), priority=Priority.INFO) for i in range(4)]
+    await storage.asave_observations(shared)
+    assert [o.content for o in await storage.aget_resource_observations("u")] == ["0", "1", "2", "3"]
+    await storage.aclose()
+    assert sorted(p.name for p in db_path.parent.glob(f"{db_path.stem}.*.db")) == [f"{db_path.stem}.{i}.db" for i in range(3)]
+
+@pytest.mark.asyncio
+async def test_sharded_sqlite_memory_creates_no_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    storage = ShardedSQLiteStorage(db_path=":memory:", shards=2)
+    await storage.ainitialize()
+    await storage.asave_messages([Message(thread_id=f"t{i}", role="user", content=str(i)) for i in range(4)])
+    assert [m.content for m in await storage.aget_messages("t3")] == ["3"]
+    await storage.aclose()
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.asyncio
+async def test_sqlite_deletes_more_ids_than_variable_limit():
+    storage = SQLiteStorage(db_path=":memory:")
+    await storage.ainitialize()
+    msgs = [Message(thread_id="t", role="user", content=str(i)) for i in range(1100)]
+    await storage.asave_messages(msgs)
+    await storage.adelete_messages([m.id for m in msgs[:1050]])
+    assert len(await storage.aget_messages("t")) == 50
+    await storage.aclose()
@@ -2,27 +2,43 @@ import pytest
 from om_memory.token_counter import TokenCounter
 from om_memory.models import Message, Observation, Priority
 
-def test_token_counter_basic():
-    counter = TokenCounter()
+def test_token_counter_basic(token_counter):
     text = "Hello world, this is a test."
-    count = counter.count(text)
+    count = token_counter.count(text)
     assert count > 0
 
-def test_token_counter_messages():
-    counter = TokenCounter()
+def test_token_counter_messages(token_counter):
     messages = [
         Message(thread_id="1", role="user", content="Hello"),
         Message(thread_id="1", role="assistant", content="Hi")
     ]
-    count = counter.count_messages(messages)
+    count = token_counter.count_messages(messages)
     assert count > 0
     assert messages[0].token_count is not None
+    # Batch total matches counting each message on its own
+    assert count == sum(token_counter.count(f"{m.role}: {m.content}") for m in messages)
 
-def test_token_counter_observations():
-    counter = TokenCounter()
+def test_token_counter_observations(token_counter):
     observations = [
         Observation(thread_id="1", priority=Priority.CRITICAL, content="Important thing")
     ]
-    count = counter.count_observations(observations)
+    count = token_counter.count_observations(observations)
     assert count > 0
     assert observations[0].token_count is not None
+
+def test_count_many_uses_encode_ordinary_batch_for_large_batches():
+    class FakeEncoding:
+        batches = 0
+        def encode_ordinary(self, text):
+            return text.split()
+        def encode_ordinary_batch(self, texts):
+            self.batches += 1
+            return [t.split() for t in texts]
+
+    counter = TokenCounter(model="custom")
+    counter.encoding = FakeEncoding()
+    messages = [Message(thread_id="1", role="user", content="a b") for _ in range(20)]
+    assert counter.count_messages(messages) == 20 * 3
+    assert counter.encoding.batches == 1
+    assert counter.count_many(["x y"]) == [2]
+    assert counter.encoding.batches == 1